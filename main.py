@@ -17,7 +17,6 @@ project_dir = Path(os.path.dirname(os.path.abspath(__file__)))
 if str(project_dir) not in sys.path:
     sys.path.insert(0, str(project_dir))
 
-from src.ui.main_window import MainWindow
 from src.utils.logger import get_logger
 from src.config.settings import ensure_dirs_exist
 
@@ -102,6 +101,10 @@ def main():
     # Создаем главное окно с задержкой
     def show_main_window():
         try:
+            # Импорт окна тянет за собой Qt-виджеты, OpenCV и numpy,
+            # поэтому выполняем его уже после отрисовки сплеш-скрина
+            from src.ui.main_window import MainWindow
+
             window = MainWindow()
             window.show()
 
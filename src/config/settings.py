@@ -5,6 +5,8 @@
 
 import os
 import json
+import atexit
+import threading
 from pathlib import Path
 from ..utils.logger import get_logger, set_log_level
 import logging
@@ -35,7 +37,13 @@ SEASON_TO_SERVER_RANGES = {
 }
 
 
-# Обратное отображение: сервер -> сезон
+# Обратное отображение: сервер -> сезон, заполняется один раз при загрузке модуля
+_SEASON_LOOKUP = [None] * (max(end for _, end in SEASON_TO_SERVER_RANGES.values()) + 1)
+for _season, (_start, _end) in SEASON_TO_SERVER_RANGES.items():
+    for _server in range(_start, _end + 1):
+        _SEASON_LOOKUP[_server] = _season
+
+
 def get_season_for_server(server_number):
     """
     Определение сезона по номеру сервера.
@@ -46,9 +54,8 @@ def get_season_for_server(server_number):
     Returns:
         Название сезона или None, если сезон не найден
     """
-    for season, (start, end) in SEASON_TO_SERVER_RANGES.items():
-        if start <= server_number <= end:
-            return season
+    if 0 <= server_number < len(_SEASON_LOOKUP):
+        return _SEASON_LOOKUP[server_number]
     return None
 
 
@@ -59,16 +66,23 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 # Создание необходимых директорий
+_dirs_ready = False
+
+
 def ensure_dirs_exist():
     """
     Убедиться, что все необходимые директории существуют.
-    Создает их, если они отсутствуют.
+    Создает их, если они отсутствуют. После первой успешной проверки ничего не делает.
     """
-    dirs = [ASSETS_DIR, IMAGES_DIR, CONFIG_DIR, LOGS_DIR]
-    for directory in dirs:
-        if not directory.exists():
-            logger.info(f"Создание директории: {directory}")
-            directory.mkdir(parents=True, exist_ok=True)
+    global _dirs_ready
+    if _dirs_ready:
+        return
+
+    # mkdir с exist_ok идемпотентен, отдельная проверка exists() не нужна
+    for directory in (ASSETS_DIR, IMAGES_DIR, CONFIG_DIR, LOGS_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    _dirs_ready = True
 
 
 # Настройки для координат
@@ -97,6 +111,10 @@ class Coordinates:
     ]
 
 
+# Задержка перед записью настроек на диск, чтобы серия изменений дала одну запись (в секундах)
+SETTINGS_SAVE_DELAY = 0.2
+
+
 # Пользовательские настройки, которые можно сохранять
 class UserSettings:
     """Класс для управления пользовательскими настройками."""
@@ -110,8 +128,14 @@ class UserSettings:
             "theme": "light",
             "log_level": "INFO"
         }
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer = None
         self.load_settings()
 
+        # Несохраненные изменения записываем при завершении приложения
+        atexit.register(self._flush)
+
     def load_settings(self):
         """
         Загрузка настроек из файла.
@@ -136,15 +160,33 @@ class UserSettings:
     def save_settings(self):
         """
         Сохранение настроек в файл.
+
+        Returns:
+            True, если настройки записаны
         """
         ensure_dirs_exist()
 
+        # Снимок берется под блокировкой: другие потоки могут менять настройки во время записи
+        with self._lock:
+            settings = dict(self.settings)
+
+        # Пишем во временный файл и подменяем атомарно, чтобы сбой записи не испортил settings.json
+        tmp_file = self.settings_file.with_name(
+            f"{self.settings_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
         try:
-            with open(self.settings_file, "w", encoding="utf-8") as file:
-                json.dump(self.settings, file, indent=4)
+            with open(tmp_file, "w", encoding="utf-8") as file:
+                json.dump(settings, file, indent=4)
+            os.replace(tmp_file, self.settings_file)
             logger.info("Настройки успешно сохранены")
+            return True
         except Exception as e:
             logger.error(f"Ошибка при сохранении настроек: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return False
 
     def get(self, key, default=None):
         """
@@ -167,12 +209,35 @@ class UserSettings:
             key: Ключ настройки
             value: Новое значение
         """
-        self.settings[key] = value
-        self.save_settings()
+        # Откладываем запись: несколько изменений подряд сохраняются одной записью
+        with self._lock:
+            self.settings[key] = value
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(SETTINGS_SAVE_DELAY, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush(self):
+        """
+        Запись отложенных изменений настроек в файл.
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+
+        if not self.save_settings():
+            # Изменения остаются несохраненными и будут записаны при следующем сбросе
+            with self._lock:
+                self._dirty = True
 
 
 # Инициализация
-ensure_dirs_exist()
 user_settings = UserSettings()
 
 # Установка уровня логирования из настроек
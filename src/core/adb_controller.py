@@ -1,15 +1,449 @@
+import asyncio
 import os
+import shlex
+import socket
+import struct
 import subprocess
+import threading
 import time
-from typing import Tuple, Optional, List, Union
+from typing import Callable, Tuple, Optional, List, Union, Dict
 import numpy as np
-import cv2
 from ..utils.logger import get_logger
+from ..utils.exceptions import ADBError
 
 logger = get_logger(__name__)
 
+# Адрес ADB сервера (демона), с которым общаемся напрямую по его протоколу
+ADB_SERVER_HOST = "127.0.0.1"
+ADB_SERVER_PORT = 5037
 
-class ADBController:
+# OpenCV загружается лениво при первом получении скриншота: импорт cv2 заметно замедляет старт
+cv2 = None
+
+
+def _load_cv2():
+    """
+    Загрузка модуля OpenCV при первом обращении.
+
+    Returns:
+        Модуль cv2
+    """
+    global cv2
+    if cv2 is None:
+        import cv2 as cv2_module
+        cv2 = cv2_module
+    return cv2
+
+
+# Маркер конца вывода команды в постоянной сессии adb shell (за ним следует код возврата)
+SHELL_END_MARKER = "__SOC_BOT_END__"
+
+# Черный кадр, возвращаемый при ошибке получения скриншота (общий, только для чтения)
+_BLACK_FRAME = np.zeros((1080, 1920, 3), dtype=np.uint8)
+_BLACK_FRAME.flags.writeable = False
+
+# Формат пикселей в заголовке raw-вывода screencap (PIXEL_FORMAT_BGRA_8888)
+SCREENCAP_FORMAT_BGRA = 5
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """
+    Чтение ровно size байт из сокета.
+
+    Args:
+        sock: Сокет ADB сервера
+        size: Количество байт для чтения
+
+    Returns:
+        Прочитанные данные
+
+    Raises:
+        ADBError: Если соединение закрыто раньше времени
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ADBError("ADB сервер закрыл соединение")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    """
+    Чтение всех данных из сокета до закрытия соединения.
+
+    Args:
+        sock: Сокет ADB сервера
+
+    Returns:
+        Прочитанные данные
+    """
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _recv_all_into(sock: socket.socket, buf: bytearray) -> int:
+    """
+    Чтение всех данных из сокета до закрытия соединения в заранее выделенный буфер.
+    Если данных больше размера буфера, буфер увеличивается.
+
+    Args:
+        sock: Сокет ADB сервера
+        buf: Буфер для данных (переиспользуется между вызовами)
+
+    Returns:
+        Количество прочитанных байт
+    """
+    offset = 0
+    view = memoryview(buf)
+    try:
+        while True:
+            if offset == len(buf):
+                # Буфер заполнен: освобождаем представление, чтобы можно было изменить размер
+                view.release()
+                buf.extend(bytes(max(len(buf), 65536)))
+                view = memoryview(buf)
+            n = sock.recv_into(view[offset:])
+            if not n:
+                return offset
+            offset += n
+    finally:
+        view.release()
+
+
+def _send_request(sock: socket.socket, request: str) -> None:
+    """
+    Отправка запроса ADB серверу (4 hex-цифры длины + тело) и проверка ответа OKAY/FAIL.
+
+    Args:
+        sock: Сокет ADB сервера
+        request: Строка запроса (например, 'host:transport:emulator-5554')
+
+    Raises:
+        ADBError: Если сервер ответил FAIL
+    """
+    payload = request.encode('utf-8')
+    sock.sendall(b"%04x" % len(payload) + payload)
+
+    status = _recv_exact(sock, 4)
+    if status == b"OKAY":
+        return
+
+    if status == b"FAIL":
+        length = int(_recv_exact(sock, 4), 16)
+        message = _recv_exact(sock, length).decode('utf-8', errors='ignore')
+        raise ADBError(message)
+
+    raise ADBError(f"Неожиданный ответ ADB сервера: {status!r}")
+
+
+def _host_request(service: str, timeout: float) -> bytes:
+    """
+    Выполнение host-сервиса ADB сервера (ответ - строка с префиксом длины).
+
+    Args:
+        service: Строка сервиса (например, 'host:devices')
+        timeout: Таймаут операций с сокетом в секундах
+
+    Returns:
+        Ответ сервиса
+
+    Raises:
+        ADBError: Если ADB сервер отклонил запрос
+        OSError: Если не удалось подключиться к ADB серверу или истек таймаут
+    """
+    with socket.create_connection((ADB_SERVER_HOST, ADB_SERVER_PORT), timeout=timeout) as sock:
+        _send_request(sock, service)
+        length = int(_recv_exact(sock, 4), 16)
+        return _recv_exact(sock, length)
+
+
+# Общий для всех контроллеров снимок состояний устройств ADB
+DEVICE_STATES_TTL = 0.5  # Время жизни снимка в секундах
+_device_states_lock = threading.Lock()
+_device_states = {}
+_device_states_time = 0.0
+
+# Перезапуском ADB сервера одновременно занимается только один контроллер
+_adb_server_lock = threading.Lock()
+
+
+def _device_state_snapshot() -> Dict[str, str]:
+    """
+    Получение состояний всех устройств ADB одним запросом (аналог 'adb devices').
+    Результат кэшируется на DEVICE_STATES_TTL, поэтому несколько контроллеров,
+    ожидающих свои устройства, делают один запрос на всех.
+
+    Returns:
+        Словарь {emulator_id: состояние}
+    """
+    global _device_states, _device_states_time
+
+    with _device_states_lock:
+        now = time.monotonic()
+        if now - _device_states_time < DEVICE_STATES_TTL:
+            return _device_states
+
+        try:
+            output = _host_request("host:devices", timeout=5).decode('utf-8', errors='ignore')
+        except (OSError, ADBError):
+            # ADB сервер недоступен: процесс adb запустит его сам
+            try:
+                output = subprocess.check_output(["adb", "devices"], stderr=subprocess.STDOUT, timeout=10)
+                output = output.decode('utf-8', errors='ignore')
+            except (subprocess.SubprocessError, OSError) as e:
+                logger.error(f"Ошибка получения списка ADB устройств: {e}")
+                output = ""
+
+        states = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and not line.startswith("List of devices"):
+                states[parts[0]] = parts[1]
+
+        _device_states = states
+        _device_states_time = now
+        return states
+
+
+class EmulatorFrameStream:
+    """
+    Непрерывное получение кадров с эмулятора через 'screenrecord --output-format=raw-frames'.
+    Фоновый поток читает кадры RGB в заранее выделенный буфер и хранит только последний кадр,
+    поэтому получение скриншота не требует отдельного запуска screencap.
+    Кадры записываются в собственном разрешении экрана (без --size), чтобы их координаты
+    совпадали с координатами команд ввода.
+    """
+
+    def __init__(self, emulator_id: str, width: int, height: int):
+        """
+        Инициализация потока кадров.
+
+        Args:
+            emulator_id: Идентификатор эмулятора (например, 'emulator-5554')
+            width: Ширина экрана эмулятора
+            height: Высота экрана эмулятора
+        """
+        self.emulator_id = emulator_id
+        self.width = width
+        self.height = height
+        self._frame_size = width * height * 3  # raw-frames отдает пиксели RGB888
+        self._buffer = bytearray(self._frame_size)
+        self._latest = None
+        self._lock = threading.Lock()
+        self._process = None
+        self._thread = None
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """True, если поток кадров активен."""
+        return self._running
+
+    def start(self) -> bool:
+        """
+        Запуск screenrecord и фонового потока чтения кадров.
+
+        Returns:
+            True если поток запущен, иначе False
+        """
+        if self._running:
+            return True
+
+        try:
+            self._process = subprocess.Popen(
+                ["adb", "-s", self.emulator_id, "exec-out", "screenrecord", "--output-format=raw-frames", "-"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+        except OSError as e:
+            logger.error(f"Не удалось запустить поток кадров для {self.emulator_id}: {e}")
+            return False
+
+        self._running = True
+        self._thread = threading.Thread(target=self._read_frames, daemon=True,
+                                        name=f"FrameStream-{self.emulator_id}")
+        self._thread.start()
+        logger.info(f"Запущен поток кадров для {self.emulator_id} ({self.width}x{self.height})")
+        return True
+
+    def _read_frames(self) -> None:
+        """
+        Чтение кадров фиксированного размера из вывода screenrecord.
+        """
+        _load_cv2()
+        view = memoryview(self._buffer)
+        stdout = self._process.stdout
+
+        try:
+            while self._running:
+                offset = 0
+                while offset < self._frame_size:
+                    read = stdout.readinto(view[offset:])
+                    if not read:
+                        raise EOFError("screenrecord завершился")
+                    offset += read
+
+                pixels = np.frombuffer(self._buffer, np.uint8).reshape(self.height, self.width, 3)
+                frame = cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
+                frame.flags.writeable = False
+
+                with self._lock:
+                    self._latest = frame
+        except (EOFError, OSError, ValueError) as e:
+            if self._running:
+                logger.warning(f"Поток кадров для {self.emulator_id} остановлен: {e}")
+        finally:
+            self._running = False
+
+    def latest(self) -> Optional[np.ndarray]:
+        """
+        Получение последнего кадра.
+
+        Returns:
+            Последний кадр (BGR, только для чтения) или None, если кадров еще не было
+        """
+        with self._lock:
+            return self._latest
+
+    def stop(self) -> None:
+        """
+        Остановка потока кадров и процесса screenrecord.
+        """
+        self._running = False
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._process = None
+        self._thread = None
+
+
+class _ADBCommandMixin:
+    """
+    Общие для синхронного и асинхронного контроллеров преобразования: ADB команда
+    в сервис ADB сервера или аргументы процесса adb, raw-вывод screencap в кадр BGR.
+    Использует атрибуты emulator_id и _adb_prefix класса-наследника.
+    """
+
+    def _reset_screencap_format(self) -> None:
+        """
+        Сброс параметров raw-вывода screencap (определяются заново по следующему кадру).
+        """
+        self._screencap_header_size = None
+        self._screencap_header = None
+        self._screencap_frame_len = None
+        self._frame_shape = None
+        self._frame_conversion = None
+
+    def _command_to_service(self, command: Union[str, List[str]]) -> Optional[str]:
+        """
+        Преобразование ADB команды в строку сервиса протокола ADB сервера.
+
+        Args:
+            command: ADB команда (например, 'shell input tap 10 20' или ['shell', 'input', 'tap', '10', '20'])
+
+        Returns:
+            Строка сервиса или None, если команда не поддерживается протоколом напрямую
+        """
+        if isinstance(command, str):
+            name, _, args = command.partition(" ")
+        else:
+            # Аргументы склеиваются через пробел так же, как это делает клиент adb
+            name, args = command[0], " ".join(command[1:])
+        if name == "shell" and args:
+            return f"shell:{args}"
+        if name == "exec-out" and args:
+            return f"exec:{args}"
+        if name == "get-state" and not args:
+            return f"host-serial:{self.emulator_id}:get-state"
+        return None
+
+    def _adb_argv(self, command: Union[str, List[str]]) -> List[str]:
+        """
+        Формирование списка аргументов процесса adb для команды (без участия оболочки).
+
+        Args:
+            command: ADB команда строкой или списком аргументов
+
+        Returns:
+            Список аргументов для subprocess
+        """
+        args = shlex.split(command) if isinstance(command, str) else list(command)
+        return [*self._adb_prefix, *args]
+
+    def _decode_raw_screencap(self, raw_data: bytes) -> Optional[np.ndarray]:
+        """
+        Преобразование raw-вывода screencap (заголовок + пиксели RGBA) в изображение BGR.
+
+        Args:
+            raw_data: Вывод команды 'screencap' без флага -p
+
+        Returns:
+            Изображение в формате numpy array (BGR) или None, если данные некорректны
+        """
+        # Заголовок не меняется, пока не меняется разрешение эмулятора: кадр с тем же заголовком
+        # разбираем по сохраненным параметрам. Сравнивается сам заголовок, а не только длина:
+        # при повороте экрана ширина и высота меняются местами, а размер кадра остается прежним
+        if len(raw_data) == self._screencap_frame_len and raw_data[:12] == self._screencap_header:
+            return self._frame_from_buffer(raw_data)
+        return self._first_frame(raw_data)
+
+    def _first_frame(self, raw_data: bytes) -> Optional[np.ndarray]:
+        """
+        Разбор заголовка raw-вывода screencap и сохранение параметров кадра.
+
+        Args:
+            raw_data: Вывод команды 'screencap' без флага -p
+
+        Returns:
+            Изображение в формате numpy array (BGR) или None, если данные некорректны
+        """
+        if len(raw_data) < 12:
+            return None
+
+        _load_cv2()
+
+        width, height, pixel_format = struct.unpack_from('<III', raw_data, 0)
+        frame_size = width * height * 4
+
+        # Размер заголовка: 12 байт до Android 9, 16 байт (с цветовым пространством) начиная с него
+        header_size = len(raw_data) - frame_size
+        if header_size not in (12, 16):
+            logger.error(f"Неожиданный размер raw-скриншота: {len(raw_data)} байт для {width}x{height}")
+            return None
+
+        self._screencap_header_size = header_size
+        self._screencap_header = bytes(raw_data[:12])
+        self._screencap_frame_len = len(raw_data)
+        self._frame_shape = (height, width, 4)
+        self._frame_conversion = (cv2.COLOR_BGRA2BGR if pixel_format == SCREENCAP_FORMAT_BGRA
+                                  else cv2.COLOR_RGBA2BGR)
+
+        return self._frame_from_buffer(raw_data)
+
+    def _frame_from_buffer(self, raw_data: bytes) -> np.ndarray:
+        """
+        Преобразование кадра с уже известным заголовком в изображение BGR.
+
+        Args:
+            raw_data: Вывод команды 'screencap' без флага -p
+
+        Returns:
+            Изображение в формате numpy array (BGR)
+        """
+        pixels = np.frombuffer(raw_data, np.uint8, offset=self._screencap_header_size).reshape(self._frame_shape)
+        return cv2.cvtColor(pixels, self._frame_conversion)
+
+
+class ADBController(_ADBCommandMixin):
     """
     Класс для взаимодействия с эмулятором через ADB команды.
     Обеспечивает функционал для отправки команд, получения скриншотов и
@@ -24,26 +458,176 @@ class ADBController:
             emulator_id: Идентификатор эмулятора (например, 'emulator-5554')
         """
         self.emulator_id = emulator_id
+        # Начало командной строки adb для этого эмулятора (процессы запускаются без оболочки)
+        self._adb_prefix = ["adb", "-s", emulator_id]
+        # Буфер для сырого вывода screencap, переиспользуется между кадрами
+        self._frame_raw = bytearray(1920 * 1080 * 4 + 16)
+        self._frame_raw_lock = threading.Lock()
+        # Параметры raw-вывода screencap, определяются по первому кадру (см. _first_frame)
+        self._reset_screencap_format()
+        # Последний полученный скриншот и время его получения
+        self._last_screenshot: Optional[np.ndarray] = None
+        self._last_screenshot_time = 0.0
+        # Время (в секундах), в течение которого повторно используется последний скриншот
+        self.screenshot_buffer_ttl = 0.1
+        # Постоянная сессия 'adb shell' для команд ввода, создается при первой команде
+        self._shell = None
+        self._shell_lock = threading.Lock()
+        # Необязательный непрерывный поток кадров (см. start_frame_stream)
+        self._frame_stream = None
         logger.info(f"Инициализация ADB контроллера для эмулятора {emulator_id}")
 
-    def execute_command(self, command: str, retry_count: int = 2) -> str:
+    def __del__(self):
+        self.close()
+
+    def start_frame_stream(self, width: Optional[int] = None, height: Optional[int] = None) -> bool:
         """
-        Выполнение ADB команды с повторными попытками.
+        Запуск непрерывного потока кадров; пока он работает, get_screenshot
+        возвращает последний полученный кадр вместо запуска screencap.
+
+        Args:
+            width: Ширина экрана эмулятора (если None, определяется по заголовку screencap)
+            height: Высота экрана эмулятора (если None, определяется по заголовку screencap)
+
+        Returns:
+            True если поток запущен, иначе False
+        """
+        if self._frame_stream is not None and self._frame_stream.is_running:
+            return True
+
+        if width is None or height is None:
+            # Размер берется из заголовка raw-вывода screencap - в тех же координатах работает tap
+            self.get_screenshot_direct()
+            if self._frame_shape is None:
+                logger.error(f"Не удалось определить разрешение экрана {self.emulator_id} для потока кадров")
+                return False
+            height, width = self._frame_shape[:2]
+
+        self._frame_stream = EmulatorFrameStream(self.emulator_id, width, height)
+        return self._frame_stream.start()
+
+    def stop_frame_stream(self) -> None:
+        """
+        Остановка непрерывного потока кадров.
+        """
+        if self._frame_stream is not None:
+            self._frame_stream.stop()
+            self._frame_stream = None
+
+    def close(self) -> None:
+        """
+        Завершение постоянной сессии adb shell и потока кадров.
+        """
+        if getattr(self, '_frame_stream', None) is not None:
+            self.stop_frame_stream()
+        shell = getattr(self, '_shell', None)
+        self._shell = None
+        if shell is not None and shell.poll() is None:
+            try:
+                shell.stdin.close()
+                shell.terminate()
+            except Exception as e:
+                logger.debug("Ошибка при завершении сессии adb shell: %s", e)
+
+    def _send_service(self, service: str, timeout: float = 10.0) -> bytes:
+        """
+        Выполнение сервиса напрямую через сокет ADB сервера, без запуска процесса adb.
+
+        Args:
+            service: Строка сервиса (например, 'shell:input tap 10 20')
+            timeout: Таймаут операций с сокетом в секундах
+
+        Returns:
+            Вывод сервиса
+
+        Raises:
+            ADBError: Если ADB сервер отклонил запрос
+            OSError: Если не удалось подключиться к ADB серверу или истек таймаут
+        """
+        # Host-сервисы отвечают строкой с префиксом длины
+        if service.startswith("host"):
+            return _host_request(service, timeout)
+
+        with socket.create_connection((ADB_SERVER_HOST, ADB_SERVER_PORT), timeout=timeout) as sock:
+            # Сервисы устройства: сначала переключаемся на транспорт эмулятора
+            _send_request(sock, f"host:transport:{self.emulator_id}")
+            _send_request(sock, service)
+            return _recv_all(sock)
+
+    def _read_screencap_into_buffer(self, timeout: float) -> int:
+        """
+        Чтение сырого вывода screencap через сокет ADB сервера в буфер self._frame_raw
+        (без выделения нового объекта bytes на каждый кадр).
+
+        Args:
+            timeout: Таймаут операций с сокетом в секундах
+
+        Returns:
+            Количество прочитанных байт
+
+        Raises:
+            ADBError: Если ADB сервер отклонил запрос
+            OSError: Если не удалось подключиться к ADB серверу или истек таймаут
+        """
+        with socket.create_connection((ADB_SERVER_HOST, ADB_SERVER_PORT), timeout=timeout) as sock:
+            _send_request(sock, f"host:transport:{self.emulator_id}")
+            _send_request(sock, "exec:screencap")
+            return _recv_all_into(sock, self._frame_raw)
+
+    def _run_command(self, command: Union[str, List[str]], timeout: float,
+                     binary: bool = False) -> Union[str, bytes]:
+        """
+        Выполнение ADB команды через протокол ADB сервера, либо через процесс adb
+        для команд, которые протоколом не поддерживаются.
 
         Args:
             command: ADB команда для выполнения
-            retry_count: Количество повторных попыток в случае ошибки
+            timeout: Таймаут в секундах
+            binary: Вернуть сырые байты вывода без декодирования
 
         Returns:
             Результат выполнения команды
         """
-        full_command = f"adb -s {self.emulator_id} {command}"
-        logger.debug(f"Выполнение ADB команды: {full_command}")
+        service = self._command_to_service(command)
+        if service is not None:
+            try:
+                result = self._send_service(service, timeout)
+                return result if binary else result.decode('utf-8', errors='ignore').strip()
+            except ConnectionRefusedError:
+                # ADB сервер не запущен: процесс adb сам его поднимет
+                logger.warning("ADB сервер недоступен, выполняем команду через процесс adb")
+
+        # Для бинарного вывода stderr не смешиваем с данными
+        stderr = subprocess.PIPE if binary else subprocess.STDOUT
+        result = subprocess.check_output(self._adb_argv(command), stderr=stderr, timeout=timeout)
+        return result if binary else result.decode('utf-8', errors='ignore').strip()
+
+    def execute_command(self, command: Union[str, List[str]], retry_count: int = 2, binary: bool = False) -> Union[str, bytes]:
+        """
+        Выполнение ADB команды с повторными попытками.
+
+        Args:
+            command: ADB команда для выполнения (строкой или списком аргументов)
+            retry_count: Количество повторных попыток в случае ошибки
+            binary: Вернуть сырые байты вывода без декодирования (для скриншотов)
+
+        Returns:
+            Результат выполнения команды (bytes при binary=True и успешном выполнении,
+            иначе строка с результатом или описанием ошибки)
+        """
+        logger.debug("Выполнение ADB команды: adb -s %s %s", self.emulator_id, command)
 
         for attempt in range(retry_count + 1):
             try:
-                result = subprocess.check_output(full_command, shell=True, stderr=subprocess.STDOUT, timeout=10)
-                return result.decode('utf-8', errors='ignore').strip()
+                return self._run_command(command, timeout=10, binary=binary)
+            except ADBError as e:
+                error_msg = str(e)
+                logger.error(f"ADB сервер отклонил команду (попытка {attempt + 1}/{retry_count + 1}): {error_msg}")
+
+                if attempt < retry_count:
+                    time.sleep(1.0)  # Пауза перед повторной попыткой
+                else:
+                    return error_msg
             except subprocess.CalledProcessError as e:
                 error_msg = e.output.decode('utf-8', errors='ignore').strip()
                 logger.error(f"Ошибка выполнения ADB команды (попытка {attempt + 1}/{retry_count + 1}): {error_msg}")
@@ -57,8 +641,9 @@ class ADBController:
                     time.sleep(1.0)  # Пауза перед повторной попыткой
                 else:
                     return error_msg
-            except subprocess.TimeoutExpired:
-                logger.error(f"Таймаут выполнения команды (попытка {attempt + 1}/{retry_count + 1}): {full_command}")
+            except (subprocess.TimeoutExpired, socket.timeout):
+                logger.error(f"Таймаут выполнения команды (попытка {attempt + 1}/{retry_count + 1}): "
+                             f"adb -s {self.emulator_id} {command}")
                 if attempt < retry_count:
                     time.sleep(1.0)  # Пауза перед повторной попыткой
                 else:
@@ -70,7 +655,7 @@ class ADBController:
                 else:
                     return f"ERROR: {str(e)}"
 
-    def execute_command_with_timeout(self, command: str, timeout: float = 30.0) -> str:
+    def execute_command_with_timeout(self, command: Union[str, List[str]], timeout: float = 30.0) -> str:
         """
         Выполнение ADB команды с таймаутом.
 
@@ -84,74 +669,160 @@ class ADBController:
         Raises:
             ADBError: При ошибке выполнения команды или превышении таймаута
         """
-        import subprocess
-        import threading
-        from ..utils.exceptions import ADBError
-
-        full_command = f"adb -s {self.emulator_id} {command}"
-        logger.debug(f"Выполнение ADB команды с таймаутом: {full_command}")
+        logger.debug("Выполнение ADB команды с таймаутом: adb -s %s %s", self.emulator_id, command)
 
-        process = subprocess.Popen(
-            full_command,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        service = self._command_to_service(command)
+        if service is not None:
+            try:
+                return self._send_service(service, timeout).decode('utf-8', errors='ignore').strip()
+            except socket.timeout:
+                raise ADBError(f"Таймаут выполнения ADB команды: {command}")
+            except ConnectionRefusedError:
+                logger.warning("ADB сервер недоступен, выполняем команду через процесс adb")
 
-        # Используем threading.Timer для обеспечения таймаута
-        timer = threading.Timer(timeout, process.kill)
         try:
+            # subprocess.run сам завершает процесс по таймауту, без отдельного потока-таймера
+            process = subprocess.run(self._adb_argv(command), capture_output=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ADBError(f"Таймаут выполнения ADB команды: {command}")
+
+        if process.returncode != 0:
+            error_msg = process.stderr.decode('utf-8', errors='ignore').strip()
+            raise ADBError(f"Ошибка выполнения ADB команды: {error_msg}")
+        return process.stdout.decode('utf-8', errors='ignore').strip()
+
+    def _run_shell(self, command: str, timeout: float = 10.0) -> Tuple[int, str]:
+        """
+        Выполнение команды в постоянной сессии adb shell, без запуска нового процесса adb.
+        После команды печатается маркер с кодом возврата, по нему определяется конец вывода.
+
+        Args:
+            command: Команда оболочки устройства (например, 'input tap 10 20')
+            timeout: Таймаут в секундах, по истечении которого сессия завершается
+
+        Returns:
+            Кортеж (код возврата, вывод команды)
+
+        Raises:
+            ADBError: Если команда отправлена, но сессия завершилась до получения результата
+                (в том числе по таймауту) - команда могла выполниться на устройстве
+            OSError: Если не удалось запустить процесс adb или отправить ему команду
+        """
+        with self._shell_lock:
+            if self._shell is None or self._shell.poll() is not None:
+                self._shell = subprocess.Popen(
+                    [*self._adb_prefix, "shell"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT
+                )
+
+            shell = self._shell
+            # Зависшая команда не должна блокировать контроллер навсегда: по таймауту завершаем сессию
+            timed_out = threading.Event()
+
+            def kill() -> None:
+                timed_out.set()
+                shell.kill()
+
+            timer = threading.Timer(timeout, kill)
             timer.start()
-            stdout, stderr = process.communicate()
-            if process.returncode != 0:
-                error_msg = stderr.decode('utf-8', errors='ignore').strip()
-                raise ADBError(f"Ошибка выполнения ADB команды: {error_msg}")
-            return stdout.decode('utf-8', errors='ignore').strip()
-        finally:
-            timer.cancel()
+            try:
+                try:
+                    shell.stdin.write(f"{command}; echo {SHELL_END_MARKER}$?\n".encode('utf-8'))
+                    shell.stdin.flush()
+                except (OSError, ValueError) as e:
+                    self._shell = None
+                    raise OSError(f"Сессия adb shell недоступна для команды: {command}") from e
+
+                output = []
+                while True:
+                    try:
+                        line = shell.stdout.readline()
+                    except ValueError:
+                        line = b""
+                    if not line:
+                        self._shell = None
+                        if timed_out.is_set():
+                            raise ADBError(f"Таймаут выполнения команды в сессии adb shell ({timeout}с): {command}")
+                        raise ADBError(f"Сессия adb shell завершилась при выполнении команды: {command}")
+
+                    text = line.decode('utf-8', errors='ignore').rstrip("\r\n")
+                    marker_pos = text.find(SHELL_END_MARKER)
+                    if marker_pos < 0:
+                        output.append(text)
+                        continue
+
+                    # Вывод без перевода строки в конце оказывается перед маркером
+                    if marker_pos > 0:
+                        output.append(text[:marker_pos])
+                    return_code = int(text[marker_pos + len(SHELL_END_MARKER):] or 0)
+                    return return_code, "\n".join(output).strip()
+            finally:
+                timer.cancel()
+
+    def shell(self, command: str) -> str:
+        """
+        Выполнение команды оболочки устройства через постоянную сессию adb shell.
+        Если сессию не удалось запустить или передать ей команду, команда выполняется
+        обычным способом через execute_command. Если команда уже отправлена, повтор
+        не делается: она могла выполниться на устройстве (например, клик).
+
+        Args:
+            command: Команда оболочки устройства (например, 'input tap 10 20')
+
+        Returns:
+            Вывод команды или описание ошибки
+        """
+        try:
+            _, output = self._run_shell(command)
+            return output
+        except OSError as e:
+            logger.warning(f"Постоянная сессия adb shell недоступна ({e}), выполняем команду отдельно")
+            return self.execute_command(f"shell {command}")
+        except ADBError as e:
+            logger.error(str(e))
+            return f"ERROR: {e}"
 
     def get_screenshot_direct(self) -> np.ndarray:
         """
         Получение скриншота напрямую через exec-out без сохранения файла.
         Это быстрее, чем стандартный метод с сохранением на устройстве.
+        Используется несжатый вывод screencap (заголовок + пиксели RGBA).
 
         Returns:
             Изображение в формате numpy array (BGR)
         """
-        try:
-            # Выполняем команду screencap с таймаутом и получаем данные напрямую
-            command = "exec-out screencap -p"
-            process = subprocess.Popen(
-                f"adb -s {self.emulator_id} {command}",
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True
-            )
-
-            # Устанавливаем таймаут
+        # Буфер переиспользуется, поэтому кадр читается и декодируется под блокировкой;
+        # декодированное изображение - новый массив и от буфера не зависит
+        with self._frame_raw_lock:
             try:
-                stdout, stderr = process.communicate(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
+                # Сырой кадр без PNG: на устройстве не тратится время на сжатие, здесь - на распаковку
+                try:
+                    size = self._read_screencap_into_buffer(timeout=5)
+                    raw_data = memoryview(self._frame_raw)[:size]
+                except ConnectionRefusedError:
+                    logger.warning("ADB сервер недоступен, выполняем команду через процесс adb")
+                    raw_data = subprocess.check_output(self._adb_argv("exec-out screencap"),
+                                                       stderr=subprocess.PIPE, timeout=5)
+            except (subprocess.TimeoutExpired, socket.timeout):
                 logger.error("Таймаут при получении скриншота")
-                return np.zeros((1080, 1920, 3), dtype=np.uint8)
-
-            if process.returncode != 0:
-                logger.error(f"Ошибка при получении скриншота: {stderr.decode('utf-8', errors='ignore')}")
-                return np.zeros((1080, 1920, 3), dtype=np.uint8)
+                return _BLACK_FRAME
+            except Exception as e:
+                logger.error(f"Ошибка при получении скриншота: {e}")
+                return _BLACK_FRAME
 
-            # Преобразуем бинарные данные в массив numpy
-            nparr = np.frombuffer(stdout, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            try:
+                img = self._decode_raw_screencap(raw_data)
 
-            if img is None:
-                logger.error("Не удалось декодировать скриншот")
-                return np.zeros((1080, 1920, 3), dtype=np.uint8)
+                if img is None:
+                    logger.error("Не удалось декодировать скриншот")
+                    return _BLACK_FRAME
 
-            return img
-        except Exception as e:
-            logger.error(f"Ошибка при получении скриншота: {e}")
-            return np.zeros((1080, 1920, 3), dtype=np.uint8)
+                return img
+            except Exception as e:
+                logger.error(f"Ошибка при получении скриншота: {e}")
+                return _BLACK_FRAME
 
     def check_adb_server(self) -> bool:
         """
@@ -160,58 +831,118 @@ class ADBController:
         Returns:
             True если ADB сервер работает корректно, иначе False
         """
+        # Обычно сервер жив: быстрая проверка через сокет без запуска процессов adb
+        if self._adb_daemon_alive():
+            return True
+
+        # Если несколько контроллеров одновременно столкнулись с ошибкой сервера,
+        # перезапуск выполняет первый, остальные дожидаются его результата
+        with _adb_server_lock:
+            return self._check_adb_server_locked()
+
+    def _adb_daemon_alive(self) -> bool:
+        """
+        Быстрая проверка, что ADB сервер принимает соединения и отвечает на запрос версии.
+
+        Returns:
+            True если ADB сервер отвечает, иначе False
+        """
         try:
-            import subprocess
+            _host_request("host:version", timeout=0.1)
+            return True
+        except (OSError, ADBError, ValueError):
+            return False
 
+    def _check_adb_server_locked(self) -> bool:
+        """
+        Проверка и перезапуск ADB сервера (вызывается под _adb_server_lock).
+
+        Returns:
+            True если ADB сервер работает корректно, иначе False
+        """
+        try:
             # Проверяем статус ADB сервера
-            result = subprocess.run("adb devices", shell=True, capture_output=True, text=True)
+            result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=10)
 
             # Если в выводе есть "daemon not running", перезапускаем ADB сервер
             if "daemon not running" in result.stdout or "daemon not running" in result.stderr:
                 logger.warning("ADB сервер не запущен, перезапуск...")
-                subprocess.run("adb kill-server", shell=True)
-                time.sleep(1)
-                subprocess.run("adb start-server", shell=True)
-                time.sleep(2)
-
-                # Проверяем снова
-                result = subprocess.run("adb devices", shell=True, capture_output=True, text=True)
-                if "daemon not running" in result.stdout or "daemon not running" in result.stderr:
-                    logger.error("Не удалось перезапустить ADB сервер")
-                    return False
+                subprocess.run(["adb", "kill-server"], timeout=10)
+                subprocess.run(["adb", "start-server"], timeout=10)
+
+                # Проверяем снова с нарастающей паузой, но не дольше 3 секунд
+                deadline = time.monotonic() + 3.0
+                delay = 0.05
+                while True:
+                    result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=10)
+                    if "daemon not running" not in result.stdout and "daemon not running" not in result.stderr:
+                        break
+                    if time.monotonic() >= deadline:
+                        logger.error("Не удалось перезапустить ADB сервер")
+                        return False
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.5)
 
             return True
         except Exception as e:
             logger.error(f"Ошибка при проверке ADB сервера: {e}")
             return False
 
-    def tap(self, x: int, y: int) -> bool:
+    def tap(self, x: int, y: int, post_delay: float = 0.0) -> bool:
         """
         Выполнить клик по координатам с проверкой успешности выполнения.
 
         Args:
             x: Координата x для клика
             y: Координата y для клика
+            post_delay: Пауза после клика в секундах (если интерфейсу нужно время на реакцию)
 
         Returns:
             True если команда была выполнена успешно, иначе False
         """
-        logger.debug(f"Клик по координатам x={x}, y={y}")
+        logger.debug("Клик по координатам x=%d, y=%d", x, y)
         try:
-            result = self.execute_command(f"shell input tap {x} {y}")
+            result = self.shell(f"input tap {x} {y}")
 
             # Проверяем, нет ли ошибок в ответе
             if "ERROR" in result or "error" in result.lower():
                 logger.error(f"Ошибка при выполнении клика: {result}")
                 return False
 
-            # Добавляем небольшую задержку после клика
-            time.sleep(0.3)
+            if post_delay > 0:
+                time.sleep(post_delay)
             return True
         except Exception as e:
             logger.error(f"Исключение при выполнении клика: {e}")
             return False
 
+    def tap_batch(self, coordinates: List[Tuple[int, int]], interval: float = 0.0) -> bool:
+        """
+        Выполнить серию кликов одной командой оболочки устройства.
+
+        Args:
+            coordinates: Список координат для кликов [(x1, y1), (x2, y2), ...]
+            interval: Пауза между кликами в секундах (выдерживается на устройстве)
+
+        Returns:
+            True если команда была выполнена успешно, иначе False
+        """
+        logger.debug("Серия кликов по точкам %s", coordinates)
+        if not coordinates:
+            return True
+
+        separator = f"; sleep {interval}; " if interval > 0 else "; "
+        try:
+            result = self.shell(separator.join(f"input tap {x} {y}" for x, y in coordinates))
+
+            if "ERROR" in result or "error" in result.lower():
+                logger.error(f"Ошибка при выполнении серии кликов: {result}")
+                return False
+            return True
+        except Exception as e:
+            logger.error(f"Исключение при выполнении серии кликов: {e}")
+            return False
+
     def swipe(self, start_x: int, start_y: int, end_x: int, end_y: int, duration_ms: int = 300) -> None:
         """
         Выполнить свайп от одной точки к другой.
@@ -223,18 +954,20 @@ class ADBController:
             end_y: Конечная координата y
             duration_ms: Продолжительность свайпа в миллисекундах
         """
-        logger.debug(f"Свайп от ({start_x}, {start_y}) к ({end_x}, {end_y}), длительность: {duration_ms}ms")
-        self.execute_command(f"shell input swipe {start_x} {start_y} {end_x} {end_y} {duration_ms}")
+        logger.debug("Свайп от (%d, %d) к (%d, %d), длительность: %dms", start_x, start_y, end_x, end_y, duration_ms)
+        self.shell(f"input swipe {start_x} {start_y} {end_x} {end_y} {duration_ms}")
 
-    def complex_swipe(self, coordinates: List[Tuple[int, int]], duration_ms: int = 800) -> None:
+    def complex_swipe(self, coordinates: List[Tuple[int, int]], duration_ms: int = 800,
+                      inter_segment_delay: float = 0.0) -> None:
         """
         Выполнить сложный свайп через несколько точек.
 
         Args:
             coordinates: Список координат для свайпа [(x1, y1), (x2, y2), ...]
             duration_ms: Общая продолжительность свайпа в миллисекундах
+            inter_segment_delay: Пауза между сегментами в секундах (выдерживается на устройстве)
         """
-        logger.debug(f"Сложный свайп через точки {coordinates}, длительность: {duration_ms}ms")
+        logger.debug("Сложный свайп через точки %s, длительность: %dms", coordinates, duration_ms)
 
         if len(coordinates) < 2:
             logger.error("Для сложного свайпа требуется минимум 2 точки")
@@ -243,102 +976,110 @@ class ADBController:
         # Разделяем общую продолжительность на отдельные свайпы
         segment_duration = duration_ms // (len(coordinates) - 1)
 
-        for i in range(len(coordinates) - 1):
-            start_x, start_y = coordinates[i]
-            end_x, end_y = coordinates[i + 1]
-            self.swipe(start_x, start_y, end_x, end_y, segment_duration)
-            time.sleep(0.1)  # Небольшая задержка между сегментами
+        # Все сегменты выполняются одной командой оболочки устройства за один вызов ADB
+        segments = [
+            f"input swipe {start_x} {start_y} {end_x} {end_y} {segment_duration}"
+            for (start_x, start_y), (end_x, end_y) in zip(coordinates, coordinates[1:])
+        ]
+        separator = f"; sleep {inter_segment_delay}; " if inter_segment_delay > 0 else "; "
+        self.shell(separator.join(segments))
 
-    def get_screenshot_buffered(self, use_buffer: bool = True) -> np.ndarray:
+    def _cached_or_fetch(self, fetcher: Callable[[], Optional[np.ndarray]], use_buffer: bool) -> np.ndarray:
         """
-        Получить скриншот с эмулятора с опцией буферизации для повышения производительности.
+        Вернуть скриншот из буфера, если он еще не устарел, иначе получить новый.
 
         Args:
+            fetcher: Функция получения нового скриншота (None при ошибке)
             use_buffer: Использовать ли буферизацию (повторно использовать последний скриншот)
 
         Returns:
-            Изображение в формате numpy array (BGR)
+            Изображение в формате numpy array (BGR), только для чтения
         """
-        if not hasattr(self, '_last_screenshot') or not hasattr(self, '_last_screenshot_time'):
-            self._last_screenshot = None
-            self._last_screenshot_time = 0
-
-        # Если буферизация включена и прошло менее 100 мс с момента последнего скриншота,
-        # возвращаем сохраненный скриншот
+        # Если буферизация включена и скриншот еще не устарел, возвращаем сохраненный скриншот
         current_time = time.time()
-        if use_buffer and self._last_screenshot is not None and (current_time - self._last_screenshot_time) < 0.1:
-            return self._last_screenshot.copy()
+        if (use_buffer and self._last_screenshot is not None and
+                (current_time - self._last_screenshot_time) < self.screenshot_buffer_ttl):
+            return self._last_screenshot
 
         logger.debug("Получение нового скриншота с эмулятора")
 
         try:
-            # Получаем скриншот через стандартный метод работы с файлами
-            self.execute_command("shell screencap -p /sdcard/screenshot.png")
+            img = fetcher()
+        except Exception as e:
+            logger.error(f"Ошибка при получении скриншота: {e}")
+            img = None
 
-            # Вместо использования промежуточного файла на хосте, читаем напрямую в память
-            raw_data = self.execute_command("exec-out cat /sdcard/screenshot.png")
+        if img is None or img.size == 0:
+            logger.error("Не удалось получить скриншот")
+            if self._last_screenshot is not None:
+                return self._last_screenshot
+            return _BLACK_FRAME
 
-            # Преобразуем бинарные данные в массив numpy
-            nparr = np.frombuffer(raw_data.encode('latin1'), np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # Сохраняем скриншот и время получения; буфер защищаем от изменения вызывающим кодом
+        img.flags.writeable = False
+        self._last_screenshot = img
+        self._last_screenshot_time = current_time
 
-            # Удаляем временный файл
-            self.execute_command("shell rm /sdcard/screenshot.png")
+        return img
 
-            if img is None:
-                logger.error("Не удалось декодировать скриншот")
-                if self._last_screenshot is not None:
-                    return self._last_screenshot.copy()
-                return np.zeros((1080, 1920, 3), dtype=np.uint8)
+    def _fetch_screenshot_exec_out(self) -> Optional[np.ndarray]:
+        """
+        Получить и декодировать сырой кадр через execute_command (с повторными попытками).
 
-            # Сохраняем скриншот и время получения
-            self._last_screenshot = img
-            self._last_screenshot_time = current_time
+        Returns:
+            Изображение в формате numpy array (BGR) или None при ошибке
+        """
+        # Получаем сырой кадр одной командой: без PNG-сжатия на устройстве и распаковки здесь
+        raw_data = self.execute_command("exec-out screencap", binary=True)
+        if not isinstance(raw_data, bytes):
+            logger.error(f"Ошибка при получении скриншота: {raw_data}")
+            return None
 
-            return img
-        except Exception as e:
-            logger.error(f"Ошибка при получении скриншота: {e}")
-            if self._last_screenshot is not None:
-                return self._last_screenshot.copy()
-            return np.zeros((1080, 1920, 3), dtype=np.uint8)
+        return self._decode_raw_screencap(raw_data)
 
-    def get_screenshot(self, use_buffer: bool = True) -> np.ndarray:
+    def get_screenshot_buffered(self, use_buffer: bool = True, copy: bool = False) -> np.ndarray:
         """
-        Получить скриншот с эмулятора.
-        Улучшенная версия с использованием прямого метода.
+        Получить скриншот с эмулятора с опцией буферизации для повышения производительности.
+
+        Возвращаемый массив доступен только для чтения и не копируется при повторном
+        использовании буфера; если изображение нужно изменять, передайте copy=True.
 
         Args:
             use_buffer: Использовать ли буферизацию (повторно использовать последний скриншот)
+            copy: Вернуть изменяемую копию изображения
 
         Returns:
-            Изображение в формате numpy array (BGR)
+            Изображение в формате numpy array (BGR), только для чтения
         """
-        if not hasattr(self, '_last_screenshot') or not hasattr(self, '_last_screenshot_time'):
-            self._last_screenshot = None
-            self._last_screenshot_time = 0
+        img = self._cached_or_fetch(self._fetch_screenshot_exec_out, use_buffer)
+        return img.copy() if copy else img
 
-        # Если буферизация включена и прошло менее 100 мс с момента последнего скриншота,
-        # возвращаем сохраненный скриншот
-        current_time = time.time()
-        if use_buffer and self._last_screenshot is not None and (current_time - self._last_screenshot_time) < 0.1:
-            return self._last_screenshot.copy()
+    def get_screenshot(self, use_buffer: bool = True, copy: bool = False) -> np.ndarray:
+        """
+        Получить скриншот с эмулятора.
+        Улучшенная версия с использованием прямого метода.
 
-        logger.debug("Получение нового скриншота с эмулятора")
+        Возвращаемый массив доступен только для чтения и не копируется при повторном
+        использовании буфера; если изображение нужно изменять, передайте copy=True.
 
-        # Используем более быстрый метод получения скриншота
-        img = self.get_screenshot_direct()
+        Args:
+            use_buffer: Использовать ли буферизацию (повторно использовать последний скриншот)
+            copy: Вернуть изменяемую копию изображения
 
-        if img is None or img.size == 0:
-            logger.error("Не удалось получить скриншот")
-            if self._last_screenshot is not None:
-                return self._last_screenshot.copy()
-            return np.zeros((1080, 1920, 3), dtype=np.uint8)
+        Returns:
+            Изображение в формате numpy array (BGR), только для чтения
+        """
+        img = None
 
-        # Сохраняем скриншот и время получения
-        self._last_screenshot = img
-        self._last_screenshot_time = current_time
+        # Если запущен поток кадров, берем из него последний кадр (только для чтения)
+        if use_buffer and self._frame_stream is not None and self._frame_stream.is_running:
+            img = self._frame_stream.latest()
 
-        return img
+        if img is None:
+            # Используем более быстрый метод получения скриншота
+            img = self._cached_or_fetch(self.get_screenshot_direct, use_buffer)
+
+        return img.copy() if copy else img
 
     def press_key(self, key_code: int) -> None:
         """
@@ -347,8 +1088,8 @@ class ADBController:
         Args:
             key_code: Код клавиши Android (например, 4 для BACK)
         """
-        logger.debug(f"Нажатие клавиши с кодом {key_code}")
-        self.execute_command(f"shell input keyevent {key_code}")
+        logger.debug("Нажатие клавиши с кодом %d", key_code)
+        self.shell(f"input keyevent {key_code}")
 
     def press_esc(self) -> None:
         """
@@ -367,12 +1108,12 @@ class ADBController:
         """
         if activity_name:
             logger.info(f"Запуск приложения {package_name}/{activity_name}")
-            cmd = f"shell am start -n {package_name}/{activity_name}"
+            cmd = f"am start -n {package_name}/{activity_name}"
         else:
             logger.info(f"Запуск приложения {package_name}")
-            cmd = f"shell monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
+            cmd = f"monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
 
-        self.execute_command(cmd)
+        self.shell(cmd)
 
     def stop_app(self, package_name: str) -> None:
         """
@@ -382,7 +1123,7 @@ class ADBController:
             package_name: Имя пакета приложения
         """
         logger.info(f"Остановка приложения {package_name}")
-        self.execute_command(f"shell am force-stop {package_name}")
+        self.shell(f"am force-stop {package_name}")
 
     def is_app_running(self, package_name: str) -> bool:
         """
@@ -394,7 +1135,7 @@ class ADBController:
         Returns:
             True если приложение запущено, иначе False
         """
-        result = self.execute_command(f"shell pidof {package_name}")
+        result = self.shell(f"pidof {package_name}")
         return bool(result.strip())
 
     def wait_for_device(self, timeout: int = 30) -> bool:
@@ -409,13 +1150,242 @@ class ADBController:
         """
         logger.info(f"Ожидание доступности устройства {self.emulator_id}")
         start_time = time.time()
+        delay = 0.05  # Начальная пауза между проверками, растет до 0.5с
 
         while time.time() - start_time < timeout:
-            result = self.execute_command("get-state")
-            if "device" in result:
+            # Состояния всех устройств берем из общего снимка, а не отдельным запросом на контроллер
+            if _device_state_snapshot().get(self.emulator_id) == "device":
                 logger.info(f"Устройство {self.emulator_id} доступно")
                 return True
-            time.sleep(1)
+            time.sleep(delay)
+            delay = min(delay * 1.6, 0.5)
 
         logger.error(f"Устройство {self.emulator_id} не доступно после {timeout}с ожидания")
-        return False
\ No newline at end of file
+        return False
+
+
+async def _async_send_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: str) -> None:
+    """
+    Асинхронная отправка запроса ADB серверу и проверка ответа OKAY/FAIL.
+
+    Args:
+        reader: Поток чтения соединения с ADB сервером
+        writer: Поток записи соединения с ADB сервером
+        request: Строка запроса (например, 'host:transport:emulator-5554')
+
+    Raises:
+        ADBError: Если сервер ответил FAIL или закрыл соединение
+    """
+    payload = request.encode('utf-8')
+    writer.write(b"%04x" % len(payload) + payload)
+    await writer.drain()
+
+    try:
+        status = await reader.readexactly(4)
+        if status == b"OKAY":
+            return
+
+        if status == b"FAIL":
+            length = int(await reader.readexactly(4), 16)
+            message = (await reader.readexactly(length)).decode('utf-8', errors='ignore')
+            raise ADBError(message)
+    except asyncio.IncompleteReadError:
+        raise ADBError("ADB сервер закрыл соединение")
+
+    raise ADBError(f"Неожиданный ответ ADB сервера: {status!r}")
+
+
+class AsyncADBController(_ADBCommandMixin):
+    """
+    Асинхронный вариант ADBController для управления многими эмуляторами из одного
+    цикла событий (без отдельного потока на каждый эмулятор).
+    Команды выполняются через сокет ADB сервера, процесс adb запускается только
+    если сервер недоступен.
+    """
+
+    def __init__(self, emulator_id: str):
+        """
+        Инициализация асинхронного контроллера ADB для конкретного эмулятора.
+
+        Args:
+            emulator_id: Идентификатор эмулятора (например, 'emulator-5554')
+        """
+        self.emulator_id = emulator_id
+        # Аргументы процесса adb, если ADB сервер недоступен
+        self._adb_prefix = ["adb", "-s", emulator_id]
+        self._reset_screencap_format()
+
+    async def _send_service(self, service: str) -> bytes:
+        """
+        Выполнение сервиса через сокет ADB сервера.
+
+        Args:
+            service: Строка сервиса (например, 'shell:input tap 10 20')
+
+        Returns:
+            Вывод сервиса
+
+        Raises:
+            ADBError: Если ADB сервер отклонил запрос
+            OSError: Если не удалось подключиться к ADB серверу
+        """
+        reader, writer = await asyncio.open_connection(ADB_SERVER_HOST, ADB_SERVER_PORT)
+        try:
+            if service.startswith("host"):
+                await _async_send_request(reader, writer, service)
+                length = int(await reader.readexactly(4), 16)
+                return await reader.readexactly(length)
+
+            await _async_send_request(reader, writer, f"host:transport:{self.emulator_id}")
+            await _async_send_request(reader, writer, service)
+            return await reader.read()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _run_command(self, command: Union[str, List[str]]) -> bytes:
+        """
+        Выполнение ADB команды через сокет ADB сервера или через процесс adb.
+
+        Args:
+            command: ADB команда строкой или списком аргументов
+
+        Returns:
+            Сырой вывод команды
+
+        Raises:
+            ADBError: Если команда завершилась с ошибкой
+        """
+        service = self._command_to_service(command)
+        if service is not None:
+            try:
+                return await self._send_service(service)
+            except ConnectionRefusedError:
+                logger.warning("ADB сервер недоступен, выполняем команду через процесс adb")
+
+        proc = await asyncio.create_subprocess_exec(
+            *self._adb_argv(command),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            out, err = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+
+        if proc.returncode != 0:
+            raise ADBError(err.decode('utf-8', errors='ignore').strip())
+        return out
+
+    async def execute_command(self, command: Union[str, List[str]], timeout: float = 10.0,
+                              binary: bool = False) -> Union[str, bytes]:
+        """
+        Асинхронное выполнение ADB команды.
+
+        Args:
+            command: ADB команда для выполнения (строкой или списком аргументов)
+            timeout: Таймаут в секундах
+            binary: Вернуть сырые байты вывода без декодирования
+
+        Returns:
+            Результат выполнения команды (bytes при binary=True и успешном выполнении,
+            иначе строка с результатом или описанием ошибки)
+        """
+        logger.debug("Асинхронное выполнение ADB команды: adb -s %s %s", self.emulator_id, command)
+        try:
+            result = await asyncio.wait_for(self._run_command(command), timeout=timeout)
+            return result if binary else result.decode('utf-8', errors='ignore').strip()
+        except asyncio.TimeoutError:
+            logger.error(f"Таймаут выполнения команды: adb -s {self.emulator_id} {command}")
+            return "ERROR: Timeout"
+        except ADBError as e:
+            logger.error(f"Ошибка выполнения ADB команды: {e}")
+            return str(e)
+        except Exception as e:
+            logger.error(f"Непредвиденная ошибка: {e}")
+            return f"ERROR: {str(e)}"
+
+    async def shell(self, command: str) -> str:
+        """
+        Выполнение команды оболочки устройства.
+
+        Args:
+            command: Команда оболочки (например, 'input tap 10 20')
+
+        Returns:
+            Вывод команды
+        """
+        return await self.execute_command(f"shell {command}")
+
+    async def tap(self, x: int, y: int) -> bool:
+        """
+        Выполнить клик по координатам.
+
+        Args:
+            x: Координата x для клика
+            y: Координата y для клика
+
+        Returns:
+            True если команда была выполнена успешно, иначе False
+        """
+        logger.debug("Клик по координатам x=%d, y=%d", x, y)
+        result = await self.shell(f"input tap {x} {y}")
+        if "ERROR" in result or "error" in result.lower():
+            logger.error(f"Ошибка при выполнении клика: {result}")
+            return False
+        return True
+
+    async def swipe(self, start_x: int, start_y: int, end_x: int, end_y: int, duration_ms: int = 300) -> None:
+        """
+        Выполнить свайп от одной точки к другой.
+
+        Args:
+            start_x: Начальная координата x
+            start_y: Начальная координата y
+            end_x: Конечная координата x
+            end_y: Конечная координата y
+            duration_ms: Продолжительность свайпа в миллисекундах
+        """
+        logger.debug("Свайп от (%d, %d) к (%d, %d), длительность: %dms", start_x, start_y, end_x, end_y, duration_ms)
+        await self.shell(f"input swipe {start_x} {start_y} {end_x} {end_y} {duration_ms}")
+
+    async def get_screenshot_direct(self) -> np.ndarray:
+        """
+        Асинхронное получение скриншота через несжатый вывод screencap.
+
+        Returns:
+            Изображение в формате numpy array (BGR), только для чтения
+        """
+        raw_data = await self.execute_command("exec-out screencap", timeout=5, binary=True)
+        if not isinstance(raw_data, bytes):
+            return _BLACK_FRAME
+
+        try:
+            img = self._decode_raw_screencap(raw_data)
+        except Exception as e:
+            logger.error(f"Ошибка при получении скриншота: {e}")
+            return _BLACK_FRAME
+
+        if img is None:
+            logger.error("Не удалось декодировать скриншот")
+            return _BLACK_FRAME
+
+        img.flags.writeable = False
+        return img
+
+
+async def gather_screenshots(controllers: List[AsyncADBController]) -> List[np.ndarray]:
+    """
+    Одновременное получение скриншотов со всех эмуляторов.
+
+    Args:
+        controllers: Список асинхронных контроллеров
+
+    Returns:
+        Список изображений в порядке controllers
+    """
+    return list(await asyncio.gather(*(ctl.get_screenshot_direct() for ctl in controllers)))
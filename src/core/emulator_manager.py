@@ -1,14 +1,139 @@
+import asyncio
 import os
 import re
 import subprocess
 import time
 import threading
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from threading import Lock
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 from ..utils.logger import get_logger
 
+try:
+    import winreg
+except ImportError:  # Реестр доступен только в Windows
+    winreg = None
+
 logger = get_logger(__name__)
 
+# Строка вывода 'ldconsole list2': индекс, имя, top_hwnd, bind_hwnd, запущен ли Android (0/1), ...
+# (в старых версиях LDPlayer колонки состояния Android может не быть)
+_LIST2_RE = re.compile(rb"^(\d+),([^,\r\n]*),(-?\d+)(?:,-?\d+,([01]))?", re.MULTILINE)
+
+# Флаг запуска процессов без консольного окна (только Windows, на других системах 0)
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Максимальное время выполнения команды ldconsole, чтобы зависший процесс не останавливал менеджер
+LDCONSOLE_TIMEOUT = 15
+# Установка APK занимает заметно больше времени, чем команды состояния и списка
+LDCONSOLE_INSTALL_TIMEOUT = 300
+
+# ADB сервер запускается заранее один раз на процесс, сколько бы менеджеров ни было создано
+_adb_server_prewarmed = False
+_adb_server_lock = threading.Lock()
+
+# Ответ 'ldconsole isrunning' для запущенного эмулятора: весь вывод целиком (в нижнем регистре),
+# чтобы текст ошибки с этими словами не считался ответом "запущен"
+_RUNNING_RE = re.compile(rb"(?:running|1)")
+
+
+def _is_running_output(buf: bytes) -> bool:
+    """
+    Проверка вывода команды 'ldconsole isrunning'.
+
+    Args:
+        buf: Сырой вывод команды
+
+    Returns:
+        True если эмулятор запущен, иначе False
+    """
+    return _RUNNING_RE.fullmatch(buf.strip().lower()) is not None
+
+
+# Стандартные пути установки LDPlayer и соответствующие пути к ldconsole.exe
+_DEFAULT_LDPLAYER_ROOTS = (
+    "C:/Program Files/LDPlayer/LDPlayer9",
+    "C:/LDPlayer/LDPlayer9",
+    "D:/LDPlayer/LDPlayer9",
+    "C:/Program Files (x86)/LDPlayer/LDPlayer9",
+    os.path.expanduser("~/AppData/Local/LDPlayer/LDPlayer9"),
+)
+_DEFAULT_LDCONSOLE_PATHS = tuple((root, os.path.join(root, "ldconsole.exe")) for root in _DEFAULT_LDPLAYER_ROOTS)
+
+
+def _probe_default_paths() -> Optional[Tuple[str, str]]:
+    """
+    Поиск LDPlayer в стандартных местах установки.
+
+    Returns:
+        Пара (путь к директории LDPlayer, путь к ldconsole.exe) или None, если LDPlayer не найден
+    """
+    for root, ldconsole in _DEFAULT_LDCONSOLE_PATHS:
+        if os.path.isfile(ldconsole):
+            return root, ldconsole
+    return None
+
+
+@lru_cache(maxsize=128)
+def _expected_serials(emulator_index: int) -> Tuple[str, str]:
+    """
+    Серийные номера ADB, под которыми может быть виден эмулятор LDPlayer
+    (порт 5554 + 2*index для emulator-*, 5555 + 2*index для 127.0.0.1:*).
+
+    Args:
+        emulator_index: Индекс эмулятора
+
+    Returns:
+        Пара серийных номеров (emulator-*, 127.0.0.1:*)
+    """
+    return f"emulator-{5554 + 2 * emulator_index}", f"127.0.0.1:{5555 + 2 * emulator_index}"
+
+
+def _cmdline_has_index(cmdline: List[str], emulator_index: int) -> bool:
+    """
+    Проверка, что командная строка процесса LDPlayer относится к эмулятору с заданным индексом
+    (индекс передается как 'index=N' или '--index N').
+
+    Args:
+        cmdline: Аргументы командной строки процесса
+        emulator_index: Индекс эмулятора
+
+    Returns:
+        True если процесс относится к эмулятору, иначе False
+    """
+    for i, arg in enumerate(cmdline):
+        if arg.split("|", 1)[0] == f"index={emulator_index}":
+            return True
+        if arg == "--index" and i + 1 < len(cmdline) and cmdline[i + 1] == str(emulator_index):
+            return True
+    return False
+
+
+# Ключ реестра, в котором установщик LDPlayer сохраняет путь установки
+LDPLAYER_REGISTRY_KEY = r"SOFTWARE\WOW6432Node\XuanZhi\LDPlayer9"
+
+
+def _find_ldplayer_in_registry() -> Optional[str]:
+    """
+    Поиск пути установки LDPlayer в реестре Windows.
+
+    Returns:
+        Путь к директории LDPlayer, если в ней есть ldconsole.exe, иначе None
+    """
+    if winreg is None:
+        return None
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, LDPLAYER_REGISTRY_KEY) as key:
+            path, _ = winreg.QueryValueEx(key, "InstallDir")
+    except OSError:
+        return None
+
+    if path and os.path.isfile(os.path.join(path, "ldconsole.exe")):
+        return path
+    return None
+
 
 class EmulatorManager:
     """
@@ -25,29 +150,81 @@ class EmulatorManager:
             ldplayer_path: Путь к директории с LDPlayer
         """
         self._lock = Lock()
-
-        # Пытаемся определить путь к LDPlayer автоматически
+        # Пул потоков для параллельного запуска нескольких эмуляторов
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="EmulatorManager")
+        # Отдельный пул для параллельных проверок через adb, чтобы они не ждали долгих запусков эмуляторов
+        self._adb_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="EmulatorManagerADB")
+
+        # ADB сервер запускаем заранее в фоне, чтобы первая команда adb не ждала его старта
+        global _adb_server_prewarmed
+        with _adb_server_lock:
+            if not _adb_server_prewarmed:
+                _adb_server_prewarmed = True
+                self._adb_pool.submit(self._start_adb_server)
+
+        # Пытаемся определить путь к LDPlayer автоматически: сначала по реестру, затем по стандартным путям
         if ldplayer_path is None:
-            default_paths = [
-                "C:/Program Files/LDPlayer/LDPlayer9",
-                "C:/LDPlayer/LDPlayer9",
-                "D:/LDPlayer/LDPlayer9"
-            ]
+            ldplayer_path = _find_ldplayer_in_registry()
 
-            for path in default_paths:
-                if os.path.exists(path):
-                    ldplayer_path = path
-                    break
+        if ldplayer_path is None:
+            found = _probe_default_paths()
+            if found is not None:
+                ldplayer_path = found[0]
 
         self.ldplayer_path = ldplayer_path
         self.ldconsole_path = os.path.join(ldplayer_path, "ldconsole.exe") if ldplayer_path else None
-        self.active_emulators = {}  # {emulator_id: emulator_index}
-
-        if self.ldplayer_path and not os.path.exists(self.ldconsole_path):
+        # Начало командной строки ldconsole (пересобирается только при смене пути)
+        self._ldc_argv_prefix = [self.ldconsole_path]
+        # ADB ID из прошлых запусков берем из настроек; перед первым использованием
+        # каждый из них проверяется по списку устройств ADB (см. get_emulator_adb_id)
+        from ..config.settings import user_settings
+        self.active_emulators = dict(user_settings.get("adb_id_cache", {}))  # {emulator_id: emulator_index}
+        # Обратный индекс {emulator_index: emulator_id}, обновляется вместе с active_emulators
+        self._index_to_adb = {idx: adb_id for adb_id, idx in self.active_emulators.items()}
+        self._verified_adb_ids = set()
+
+        # Кэш результата list_emulators: (время получения, список эмуляторов)
+        self._list_cache = None
+        self._list_ttl = 0.5  # Время жизни кэша в секундах
+        # Эмуляторы из последнего списка по индексу (строкой) для поиска за O(1)
+        self._by_index = {}
+        # Выполняющийся запрос списка: параллельные вызовы ждут его, а не запускают ldconsole заново
+        self._list_inflight = None
+        self._list_inflight_lock = Lock()
+        self._list_inflight_async = None
+
+        # Кэш результата 'adb devices -l': (время получения, {serial: статус})
+        self._adb_scan_cache = None
+        self._adb_scan_ttl = 1.0  # Время жизни кэша в секундах
+
+        # Путь к ldconsole проверяется один раз при установке, а не перед каждой командой
+        self._ldconsole_valid = bool(self.ldconsole_path) and os.path.isfile(self.ldconsole_path)
+        if self.ldplayer_path and not self._ldconsole_valid:
             logger.error(f"ldconsole.exe не найден по пути: {self.ldconsole_path}")
 
         logger.info(f"Инициализация менеджера эмуляторов. Путь к LDPlayer: {ldplayer_path}")
 
+    @staticmethod
+    def _start_adb_server() -> None:
+        """
+        Запуск ADB сервера (если он уже запущен, команда ничего не делает).
+        """
+        try:
+            subprocess.run(["adb", "start-server"], capture_output=True, timeout=5, creationflags=_NO_WINDOW)
+        except Exception as e:
+            logger.warning(f"Не удалось запустить ADB сервер: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Завершение пулов потоков менеджера (вызывается при закрытии приложения).
+
+        Args:
+            wait: Дождаться завершения уже запущенных задач
+        """
+        self._pool.shutdown(wait=wait)
+        self._adb_pool.shutdown(wait=wait)
+        logger.debug("Пулы потоков менеджера эмуляторов завершены")
+
     def set_ldplayer_path(self, path: str) -> bool:
         """
         Установка пути к директории LDPlayer.
@@ -68,64 +245,79 @@ class EmulatorManager:
 
             self.ldplayer_path = path
             self.ldconsole_path = ldconsole
+            self._ldc_argv_prefix = [ldconsole]
+            self._ldconsole_valid = True
             logger.info(f"Установлен путь к LDPlayer: {path}")
             return True
 
     def _try_find_ldplayer(self):
         """
-        Попытка автоматически найти LDPlayer в стандартных местах.
+        Попытка автоматически найти LDPlayer по реестру или в стандартных местах.
         """
-        default_paths = [
-            "C:/Program Files/LDPlayer/LDPlayer9",
-            "C:/LDPlayer/LDPlayer9",
-            "D:/LDPlayer/LDPlayer9",
-            "C:/Program Files (x86)/LDPlayer/LDPlayer9",
-            os.path.expanduser("~/AppData/Local/LDPlayer/LDPlayer9")
-        ]
+        registry_path = _find_ldplayer_in_registry()
+        if registry_path is not None:
+            found = (registry_path, os.path.join(registry_path, "ldconsole.exe"))
+        else:
+            found = _probe_default_paths()
+
+        if found is None:
+            logger.error("Не удалось автоматически найти LDPlayer")
+            return False
 
-        for path in default_paths:
-            ldconsole = os.path.join(path, "ldconsole.exe")
-            if os.path.exists(ldconsole):
-                self.ldplayer_path = path
-                self.ldconsole_path = ldconsole
-                logger.info(f"Автоматически найден путь к LDPlayer: {path}")
+        path, ldconsole = found
+        self.ldplayer_path = path
+        self.ldconsole_path = ldconsole
+        self._ldc_argv_prefix = [ldconsole]
+        self._ldconsole_valid = True
+        logger.info(f"Автоматически найден путь к LDPlayer: {path}")
 
-                # Сохраняем в настройках
-                from ..config.settings import user_settings
-                user_settings.set("ldplayer_path", path)
+        # Сохраняем в настройках
+        from ..config.settings import user_settings
+        user_settings.set("ldplayer_path", path)
 
-                return True
+        return True
 
-        logger.error("Не удалось автоматически найти LDPlayer")
-        return False
+    def _ldconsole_argv(self, command: Union[str, List[str]]) -> List[str]:
+        """
+        Формирование списка аргументов процесса ldconsole (запуск без cmd.exe).
 
-    def execute_ldconsole_with_timeout(self, command: str, timeout: float = 5.0) -> str:
+        Args:
+            command: Команда строкой (аргументы без пробелов внутри) или списком аргументов
+
+        Returns:
+            Список аргументов для subprocess
+        """
+        args = command.split() if isinstance(command, str) else command
+        return self._ldc_argv_prefix + args
+
+    def execute_ldconsole_with_timeout(self, command: Union[str, List[str]], timeout: float = 5.0) -> str:
         """
         Выполнение команды ldconsole с таймаутом.
 
         Args:
-            command: Команда для выполнения
+            command: Команда для выполнения (строкой или списком аргументов)
             timeout: Таймаут в секундах
 
         Returns:
             Результат выполнения команды
         """
-        if not self.ldconsole_path or not os.path.exists(self.ldconsole_path):
+        if not self._ldconsole_valid:
             logger.error(f"Путь к ldconsole.exe не установлен или неверный: {self.ldconsole_path}")
             return ""
 
         try:
-            full_command = f'"{self.ldconsole_path}" {command}'
-            logger.debug(f"Выполнение команды LDConsole с таймаутом {timeout}с: {full_command}")
+            argv = self._ldconsole_argv(command)
+            logger.debug(f"Выполнение команды LDConsole с таймаутом {timeout}с: {argv}")
 
-            import subprocess
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True, timeout=timeout)
+            result = subprocess.run(argv, capture_output=True, timeout=timeout, creationflags=_NO_WINDOW)
 
+            # Вывод ldconsole в UTF-8, а не в кодировке локали Windows: декодируем сами
             if result.returncode != 0:
-                logger.error(f"Ошибка выполнения команды LDConsole: {result.stderr}")
-                return result.stderr
+                stderr = result.stderr.decode('utf-8', errors='ignore')
+                logger.error(f"Ошибка выполнения команды LDConsole: {stderr}")
+                return stderr
 
-            return result.stdout.strip()
+            return result.stdout.decode('utf-8', errors='ignore').strip()
         except subprocess.TimeoutExpired:
             logger.error(f"Таймаут выполнения команды LDConsole: {command}")
             return "ERROR: Timeout"
@@ -133,149 +325,294 @@ class EmulatorManager:
             logger.error(f"Непредвиденная ошибка при выполнении команды LDConsole: {e}")
             return ""
 
-    def execute_ldconsole(self, command: str) -> str:
+    def execute_ldconsole_bytes(self, command: Union[str, List[str]], timeout: float = LDCONSOLE_TIMEOUT) -> bytes:
         """
-        Выполнение команды ldconsole.
+        Выполнение команды ldconsole с возвратом сырого вывода (без декодирования).
+
+        Args:
+            command: Команда для выполнения (строкой или списком аргументов)
+            timeout: Таймаут в секундах
+
+        Returns:
+            Вывод команды
         """
-        if not self.ldconsole_path or not os.path.exists(self.ldconsole_path):
+        if not self._ldconsole_valid:
             logger.error(f"Путь к ldconsole.exe не установлен или неверный: {self.ldconsole_path}")
             # Пробуем найти LDPlayer автоматически
-            self._try_find_ldplayer()
-
-            # Повторная проверка
-            if not self.ldconsole_path or not os.path.exists(self.ldconsole_path):
-                return ""
+            if not self._try_find_ldplayer():
+                return b""
 
         try:
-            full_command = f'"{self.ldconsole_path}" {command}'
-            logger.debug(f"Выполнение команды LDConsole: {full_command}")
+            argv = self._ldconsole_argv(command)
+            logger.debug(f"Выполнение команды LDConsole: {argv}")
 
-            result = subprocess.check_output(full_command, shell=True, stderr=subprocess.STDOUT, timeout=30)
-            return result.decode('utf-8', errors='ignore').strip()
+            return subprocess.check_output(argv, stderr=subprocess.STDOUT, timeout=timeout,
+                                           creationflags=_NO_WINDOW)
         except subprocess.CalledProcessError as e:
             logger.error(f"Ошибка выполнения команды LDConsole: {e}")
-            return e.output.decode('utf-8', errors='ignore').strip()
+            return e.output
         except subprocess.TimeoutExpired:
             logger.error(f"Таймаут выполнения команды LDConsole: {command}")
-            return "ERROR: Timeout"
+            return b"ERROR: Timeout"
         except Exception as e:
             logger.error(f"Непредвиденная ошибка при выполнении команды LDConsole: {e}")
-            return ""
+            return b""
+
+    def execute_ldconsole(self, command: Union[str, List[str]]) -> str:
+        """
+        Выполнение команды ldconsole.
+
+        Args:
+            command: Команда для выполнения (строкой или списком аргументов)
+        """
+        return self.execute_ldconsole_bytes(command).decode('utf-8', errors='ignore').strip()
+
+    def execute_many(self, commands: List[Union[str, List[str]]], timeout: float = 5.0) -> List[str]:
+        """
+        Выполнение нескольких команд ldconsole одновременно.
+
+        Args:
+            commands: Список команд (строками или списками аргументов)
+            timeout: Таймаут каждой команды в секундах
+
+        Returns:
+            Результаты команд в порядке commands
+        """
+        futures = [self._pool.submit(self.execute_ldconsole_with_timeout, command, timeout) for command in commands]
+        return [future.result() for future in futures]
 
     def list_emulators(self) -> List[Dict[str, str]]:
         """
         Получение списка всех эмуляторов LDPlayer.
+        Результат кэшируется на короткое время, чтобы циклы ожидания и проверки
+        состояния не запускали ldconsole повторно.
         """
-        with self._lock:
-            result = self.execute_ldconsole("list2")
-            logger.debug(f"Результат команды list2: {result}")
-            emulators = []
+        cache = self._list_cache
+        if cache is not None and time.monotonic() - cache[0] < self._list_ttl:
+            return cache[1]
+
+        # Если список уже запрашивается в другом потоке, дожидаемся его результата
+        with self._list_inflight_lock:
+            inflight = self._list_inflight
+            if inflight is None:
+                self._list_inflight = Future()
+        if inflight is not None:
+            return inflight.result()
+
+        future = self._list_inflight
+        try:
+            with self._lock:
+                raw = self.execute_ldconsole_bytes("list2")
+                logger.debug(f"Результат команды list2: {raw!r}")
 
-            for line in result.splitlines():
-                if not line.strip():
-                    continue
+                emulators = self._parse_list2(raw)
+
+                logger.info(f"Найдено {len(emulators)} эмуляторов")
+                self._store_list_cache(emulators)
+            future.set_result(emulators)
+            return emulators
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._list_inflight_lock:
+                self._list_inflight = None
+
+    @staticmethod
+    def _parse_list2(raw: bytes) -> List[Dict[str, str]]:
+        """
+        Разбор вывода команды 'ldconsole list2'.
+        Статус берется из колонок list2, без отдельного isrunning на каждый эмулятор.
+
+        Args:
+            raw: Сырой вывод команды list2
+
+        Returns:
+            Список эмуляторов [{"index", "name", "status"}, ...]
+        """
+        emulators = []
+        for match in _LIST2_RE.finditer(raw):
+            index, name, top_hwnd, android_started = match.groups()
+            if android_started is not None:
+                is_running = android_started == b"1"
+            else:
+                # Нет колонки состояния Android: эмулятор запущен, если у него есть окно
+                is_running = top_hwnd != b"0"
+            logger.debug(f"Эмулятор {index.decode()}: top_hwnd={top_hwnd.decode()}, "
+                         f"android={android_started!r}")
+
+            emulators.append({
+                "index": index.decode(),
+                "name": name.decode('utf-8', errors='ignore'),
+                "status": "running" if is_running else "stopped"
+            })
+        return emulators
+
+    def _store_list_cache(self, emulators: List[Dict[str, str]]) -> None:
+        """
+        Сохранение списка эмуляторов в кэш вместе с индексом по номеру эмулятора.
 
-                parts = line.split(',')
+        Args:
+            emulators: Список эмуляторов
+        """
+        self._by_index = {emu["index"]: emu for emu in emulators}
+        self._list_cache = (time.monotonic(), emulators)
 
-                if len(parts) >= 3:
-                    emulator_index = parts[0]
+    def get_emulator(self, emulator_index: int) -> Optional[Dict[str, str]]:
+        """
+        Получение описания эмулятора по его индексу (из кэшированного списка эмуляторов).
 
-                    # Проверяем статус напрямую через isrunning
-                    running_result = self.execute_ldconsole(f"isrunning --index {emulator_index}")
-                    is_running = "running" in running_result.lower() or "1" in running_result
+        Args:
+            emulator_index: Индекс эмулятора
 
-                    emulator = {
-                        "index": emulator_index,
-                        "name": parts[1],
-                        "status": "running" if is_running else "stopped"
-                    }
-                    emulators.append(emulator)
+        Returns:
+            Словарь {"index", "name", "status"} или None, если эмулятор не найден
+        """
+        self.list_emulators()
+        return self._by_index.get(str(emulator_index))
 
-            logger.info(f"Найдено {len(emulators)} эмуляторов")
-            return emulators
+    def _invalidate_list_cache(self) -> None:
+        """
+        Сброс кэша списка эмуляторов (после запуска или остановки эмулятора).
+        """
+        self._list_cache = None
 
     def get_adb_devices(self) -> Dict[str, str]:
         """
         Получение списка устройств ADB.
+        Одна команда 'adb devices -l' на все эмуляторы, результат кэшируется на короткое время.
 
         Returns:
             Словарь {emulator_id: emulator_status}
         """
+        cache = self._adb_scan_cache
+        if cache is not None and time.monotonic() - cache[0] < self._adb_scan_ttl:
+            return cache[1]
+
         try:
-            result = subprocess.check_output("adb devices", shell=True)
+            result = subprocess.check_output(["adb", "devices", "-l"], timeout=5, creationflags=_NO_WINDOW)
             result = result.decode('utf-8').strip()
 
             devices = {}
             for line in result.splitlines()[1:]:  # Пропускаем заголовок
-                if not line.strip():
-                    continue
-
                 parts = line.split()
                 if len(parts) >= 2:
-                    device_id = parts[0]
-                    status = parts[1]
-                    devices[device_id] = status
+                    devices[parts[0]] = parts[1]
 
             logger.debug(f"ADB устройства: {devices}")
+            self._adb_scan_cache = (time.monotonic(), devices)
             return devices
-        except subprocess.CalledProcessError as e:
+        except (OSError, subprocess.SubprocessError) as e:
+            # adb может отсутствовать в PATH (LDPlayer использует свой) или зависнуть:
+            # ошибка не кэшируется, и вызывающий код переходит к запросу через ldconsole
             logger.error(f"Ошибка получения списка ADB устройств: {e}")
             return {}
 
+    def _find_adb_serial(self, emulator_index: int) -> Optional[str]:
+        """
+        Поиск ADB ID эмулятора в списке устройств ADB по ожидаемым серийным номерам.
+
+        Args:
+            emulator_index: Индекс эмулятора
+
+        Returns:
+            ADB ID подключенного эмулятора или None
+        """
+        devices = self.get_adb_devices()
+        for device_id in _expected_serials(emulator_index):
+            if devices.get(device_id) == "device":
+                return device_id
+        return None
+
+    def _remember_adb_id(self, device_id: str, emulator_index: int) -> None:
+        """
+        Сохранение ADB ID эмулятора в словаре активных эмуляторов и в настройках.
+
+        Args:
+            device_id: ADB ID эмулятора
+            emulator_index: Индекс эмулятора
+        """
+        with self._lock:  # Используем lock только для краткой операции записи в словарь
+            previous = self._index_to_adb.get(str(emulator_index))
+            if previous is not None and previous != device_id:
+                self.active_emulators.pop(previous, None)
+            self.active_emulators[device_id] = str(emulator_index)
+            self._index_to_adb[str(emulator_index)] = device_id
+            self._verified_adb_ids.add(device_id)
+        self._save_adb_ids()
+
+    def _forget_adb_ids(self, indices: List[str]) -> None:
+        """
+        Удаление эмуляторов из словаря активных эмуляторов и из настроек.
+
+        Args:
+            indices: Индексы эмуляторов (строками)
+        """
+        with self._lock:
+            for index in indices:
+                adb_id = self._index_to_adb.pop(index, None)
+                # Порт мог уже перейти к другому эмулятору - его запись не трогаем
+                if adb_id is not None and self.active_emulators.get(adb_id) == index:
+                    del self.active_emulators[adb_id]
+        self._save_adb_ids()
+
+    def _save_adb_ids(self) -> None:
+        """
+        Сохранение известных ADB ID в настройках, чтобы не определять их заново после перезапуска.
+        """
+        from ..config.settings import user_settings
+        with self._lock:
+            adb_ids = dict(self.active_emulators)
+        user_settings.set("adb_id_cache", adb_ids)
+
     def get_emulator_adb_id(self, emulator_index: int) -> Optional[str]:
         """
         Получение ADB ID для эмулятора LDPlayer по его индексу.
         Улучшенная версия, которая не блокирует основной поток.
         """
         try:
-            # Если уже знаем ID, вернем его сразу
-            for adb_id, idx in self.active_emulators.items():
-                if idx == str(emulator_index):
-                    logger.info(f"Используем сохраненный ADB ID для эмулятора {emulator_index}: {adb_id}")
-                    return adb_id
+            # Если уже знаем ID в этом запуске, вернем его сразу
+            adb_id = self._index_to_adb.get(str(emulator_index))
+            if adb_id is not None and adb_id in self._verified_adb_ids:
+                logger.info(f"Используем сохраненный ADB ID для эмулятора {emulator_index}: {adb_id}")
+                return adb_id
 
             # Проверяем, запущен ли эмулятор БЕЗ блокирования с помощью lock
-            emulators = self.list_emulators()
-            emulator_running = False
-
-            for emu in emulators:
-                if emu["index"] == str(emulator_index) and emu["status"] == "running":
-                    emulator_running = True
-                    break
-
-            if not emulator_running:
+            emu = self.get_emulator(emulator_index)
+            if emu is None or emu["status"] != "running":
                 logger.warning(f"Эмулятор {emulator_index} не запущен, пропускаем получение ADB ID")
                 return None
 
+            if adb_id is not None:
+                # ID из прошлого запуска принимаем, только если его порт принадлежит этому индексу:
+                # иначе на нем может оказаться другой эмулятор
+                if (adb_id in _expected_serials(emulator_index) and
+                        self.get_adb_devices().get(adb_id) == "device"):
+                    self._verified_adb_ids.add(adb_id)
+                    logger.info(f"Используем сохраненный ADB ID для эмулятора {emulator_index}: {adb_id}")
+                    return adb_id
+
+                logger.debug(f"Сохраненный ADB ID {adb_id} для эмулятора {emulator_index} устарел")
+                self._forget_adb_ids([str(emulator_index)])
+
+            # Сначала ищем в общем списке устройств ADB (одна команда на все эмуляторы)
+            device_id = self._find_adb_serial(emulator_index)
+            if device_id:
+                self._remember_adb_id(device_id, emulator_index)
+                logger.info(f"Получен ADB ID для эмулятора {emulator_index} через список устройств: {device_id}")
+                return device_id
+
             # Получаем ADB ID через LDConsole с таймаутом
             logger.debug(f"Получение ADB ID для эмулятора {emulator_index}")
-            result = self.execute_ldconsole_with_timeout(f"adb --index {emulator_index} --command \"get-serialno\"",
-                                                         timeout=5)
+            result = self.execute_ldconsole_with_timeout(
+                ["adb", "--index", str(emulator_index), "--command", "get-serialno"], timeout=5)
 
             if result and result.strip():
                 device_id = result.strip()
-                with self._lock:  # Используем lock только для краткой операции записи в словарь
-                    self.active_emulators[device_id] = str(emulator_index)
+                self._remember_adb_id(device_id, emulator_index)
                 logger.info(f"Получен ADB ID для эмулятора {emulator_index}: {device_id}")
                 return device_id
 
-            # Альтернативный способ - получить через список устройств ADB
-            adb_devices = self.get_adb_devices()
-
-            # Для LDPlayer обычно используется порт 5554 + 2*index или 5555 + 2*index
-            expected_port1 = 5554 + emulator_index * 2
-            expected_port2 = 5555 + emulator_index * 2
-
-            for device_id, status in adb_devices.items():
-                if status == "device" and (
-                        f"emulator-{expected_port1}" in device_id or
-                        f"127.0.0.1:{expected_port2}" in device_id
-                ):
-                    with self._lock:  # Краткая операция записи
-                        self.active_emulators[device_id] = str(emulator_index)
-                    logger.info(f"Получен ADB ID для эмулятора {emulator_index} через список устройств: {device_id}")
-                    return device_id
-
             logger.error(f"Не удалось получить ADB ID для эмулятора {emulator_index}")
             return None
 
@@ -283,6 +620,28 @@ class EmulatorManager:
             logger.error(f"Ошибка при получении ADB ID для эмулятора {emulator_index}: {e}")
             return None
 
+    def _is_running_fast(self, emulator_index: int) -> bool:
+        """
+        Проверка, запущен ли эмулятор: по кэшу списка эмуляторов, если он еще действителен,
+        иначе одной командой 'isrunning' для этого эмулятора (без получения всего списка).
+
+        Args:
+            emulator_index: Индекс эмулятора
+
+        Returns:
+            True если эмулятор запущен, иначе False
+        """
+        cache = self._list_cache
+        if cache is not None and time.monotonic() - cache[0] < self._list_ttl:
+            emu = self._by_index.get(str(emulator_index))
+            return emu is not None and emu["status"] == "running"
+
+        try:
+            return _is_running_output(self.execute_ldconsole_bytes(f"isrunning --index {emulator_index}", timeout=3))
+        except Exception as e:
+            logger.error(f"Ошибка при проверке статуса эмулятора {emulator_index}: {e}")
+            return False
+
     def start_emulator(self, emulator_index: int) -> bool:
         """
         Запуск эмулятора LDPlayer по его индексу.
@@ -295,46 +654,132 @@ class EmulatorManager:
             True если эмулятор запущен успешно, иначе False
         """
         # Проверяем, не запущен ли уже эмулятор
-        emulators = self.list_emulators()
-        for emu in emulators:
-            if emu["index"] == str(emulator_index) and emu["status"] == "running":
-                logger.info(f"Эмулятор {emulator_index} уже запущен")
-                return True
+        if self._is_running_fast(emulator_index):
+            logger.info(f"Эмулятор {emulator_index} уже запущен")
+            return True
 
         # Запускаем эмулятор - короткая операция с lock
         logger.info(f"Запуск эмулятора с индексом {emulator_index}")
         result = self.execute_ldconsole_with_timeout(f"launch --index {emulator_index}", timeout=5)
+        self._invalidate_list_cache()
 
         # Проверяем запуск без удержания lock
         start_time = time.time()
         max_wait_time = 30  # Максимальное время ожидания в секундах
-        check_interval = 2  # Интервал проверки в секундах
+        check_interval = 0.2  # Начальный интервал проверки, растет до 2 секунд
 
         while time.time() - start_time < max_wait_time:
             # Проверяем статус без блокировки
-            is_running = False
-            try:
-                result = self.execute_ldconsole_with_timeout(
-                    f"isrunning --index {emulator_index}",
-                    timeout=3
-                )
-                is_running = "running" in result.lower() or "1" in result
-            except Exception as e:
-                logger.error(f"Ошибка при проверке статуса эмулятора {emulator_index}: {e}")
-
-            if is_running:
+            if self._is_running_fast(emulator_index):
                 logger.info(f"Эмулятор {emulator_index} успешно запущен")
                 return True
 
             logger.debug(f"Ожидание запуска эмулятора {emulator_index}, прошло {time.time() - start_time:.1f}с")
             time.sleep(check_interval)
+            check_interval = min(2.0, check_interval * 1.5)
 
         logger.error(f"Не удалось запустить эмулятор {emulator_index} после {max_wait_time}с ожидания")
         return False
 
+    def start_emulators_async(self, indices: List[int]) -> List[Future]:
+        """
+        Параллельный запуск нескольких эмуляторов.
+
+        Args:
+            indices: Список индексов эмуляторов
+
+        Returns:
+            Список Future с результатами start_emulator (True/False) в порядке indices
+        """
+        return [self._pool.submit(self.start_emulator, index) for index in indices]
+
+    def wait_for_states(self, target: Dict[int, str], timeout: float = 60.0) -> Dict[int, bool]:
+        """
+        Ожидание, пока эмуляторы перейдут в заданные состояния.
+        За один цикл выполняется один запрос списка эмуляторов для всех ожидаемых эмуляторов.
+
+        Args:
+            target: Словарь {индекс эмулятора: ожидаемый статус ("running" или "stopped")}
+            timeout: Максимальное время ожидания в секундах
+
+        Returns:
+            Словарь {индекс эмулятора: True если статус достигнут, иначе False}
+        """
+        pending = set(target)
+        deadline = time.monotonic() + timeout
+        check_interval = 0.2  # Начальный интервал проверки, растет до 2 секунд
+
+        while pending:
+            statuses = {emu["index"]: emu["status"] for emu in self.list_emulators()}
+            done = {index for index in pending if statuses.get(str(index)) == target[index]}
+            pending -= done
+
+            if not pending or time.monotonic() >= deadline:
+                break
+
+            logger.debug(f"Ожидание смены состояния эмуляторов: {sorted(pending)}")
+            time.sleep(check_interval)
+            check_interval = min(2.0, check_interval * 1.5)
+
+        for index in pending:
+            logger.error(f"Эмулятор {index} не перешел в состояние '{target[index]}' за {timeout}с")
+
+        return {index: index not in pending for index in target}
+
+    def start_emulators(self, indices: List[int], timeout: float = 60.0) -> Dict[int, bool]:
+        """
+        Запуск нескольких эмуляторов: команды запуска отправляются параллельно,
+        после чего состояние всех эмуляторов ожидается одним циклом опроса.
+
+        Args:
+            indices: Список индексов эмуляторов
+            timeout: Максимальное время ожидания запуска в секундах
+
+        Returns:
+            Словарь {индекс эмулятора: True если эмулятор запущен, иначе False}
+        """
+        statuses = {emu["index"]: emu["status"] for emu in self.list_emulators()}
+        to_launch = [index for index in indices if statuses.get(str(index)) != "running"]
+
+        if to_launch:
+            logger.info(f"Запуск эмуляторов с индексами {to_launch}")
+            self.execute_many([f"launch --index {index}" for index in to_launch], timeout=5)
+            self._invalidate_list_cache()
+
+        return self.wait_for_states({index: "running" for index in indices}, timeout=timeout)
+
+    def stop_emulators(self, indices: List[int], timeout: float = 60.0) -> Dict[int, bool]:
+        """
+        Остановка нескольких эмуляторов: команды остановки отправляются параллельно,
+        после чего состояние всех эмуляторов ожидается одним циклом опроса.
+
+        Args:
+            indices: Список индексов эмуляторов
+            timeout: Максимальное время ожидания остановки в секундах
+
+        Returns:
+            Словарь {индекс эмулятора: True если эмулятор остановлен, иначе False}
+        """
+        statuses = {emu["index"]: emu["status"] for emu in self.list_emulators()}
+        to_quit = [index for index in indices if statuses.get(str(index)) == "running"]
+
+        if to_quit:
+            logger.info(f"Остановка эмуляторов с индексами {to_quit}")
+            self.execute_many([f"quit --index {index}" for index in to_quit], timeout=5)
+            self._invalidate_list_cache()
+
+        results = self.wait_for_states({index: "stopped" for index in indices}, timeout=timeout)
+
+        # Удаляем остановленные эмуляторы из словаря активных эмуляторов
+        self._forget_adb_ids([str(index) for index, ok in results.items() if ok])
+
+        return results
+
     def stop_emulator(self, emulator_index: int) -> bool:
         """
         Остановка эмулятора LDPlayer по его индексу.
+        Блокировка удерживается только на время отправки команды и очистки словаря,
+        ожидание остановки выполняется без нее.
 
         Args:
             emulator_index: Индекс эмулятора
@@ -342,53 +787,81 @@ class EmulatorManager:
         Returns:
             True если эмулятор остановлен успешно, иначе False
         """
+        logger.info(f"Остановка эмулятора с индексом {emulator_index}")
+
+        # Проверяем, запущен ли эмулятор
+        emu = self.get_emulator(emulator_index)
+        if emu is None:
+            logger.warning(f"Эмулятор {emulator_index} не найден")
+            return False
+
+        if emu["status"] == "stopped":
+            logger.info(f"Эмулятор {emulator_index} уже остановлен")
+            return True
+
+        self._send_quit(emulator_index)
+
+        if not self._await_stopped(emulator_index):
+            return False
+
+        logger.info(f"Эмулятор {emulator_index} успешно остановлен")
+        self._cleanup_active(emulator_index)
+        return True
+
+    def _send_quit(self, emulator_index: int) -> None:
+        """
+        Отправка команды остановки эмулятора.
+
+        Args:
+            emulator_index: Индекс эмулятора
+        """
         with self._lock:
-            logger.info(f"Остановка эмулятора с индексом {emulator_index}")
-
-            # Проверяем, запущен ли эмулятор
-            emulators = self.list_emulators()
-            is_running = False
-
-            for emu in emulators:
-                if emu["index"] == str(emulator_index):
-                    if emu["status"] == "stopped":
-                        logger.info(f"Эмулятор {emulator_index} уже остановлен")
-                        return True
-                    is_running = True
-                    break
-
-            if not is_running:
-                logger.warning(f"Эмулятор {emulator_index} не найден")
-                return False
+            self.execute_ldconsole(f"quit --index {emulator_index}")
+        self._invalidate_list_cache()
 
-            # Останавливаем эмулятор
-            result = self.execute_ldconsole(f"quit --index {emulator_index}")
+    def _await_stopped(self, emulator_index: int, max_wait_time: float = 15.0) -> bool:
+        """
+        Ожидание остановки эмулятора: первая проверка сразу после команды, затем с нарастающим интервалом.
 
-            # Ждем остановки эмулятора
-            max_attempts = 15
-            for attempt in range(max_attempts):
-                time.sleep(1)  # Ждем 1 секунду между проверками
+        Args:
+            emulator_index: Индекс эмулятора
+            max_wait_time: Максимальное время ожидания в секундах
 
-                emulators = self.list_emulators()
-                for emu in emulators:
-                    if emu["index"] == str(emulator_index) and emu["status"] == "stopped":
-                        logger.info(f"Эмулятор {emulator_index} успешно остановлен")
+        Returns:
+            True если эмулятор остановлен, иначе False
+        """
+        start_time = time.time()
+        check_interval = 0.2  # Начальный интервал проверки, растет до 2 секунд
 
-                        # Удаляем из словаря активных эмуляторов
-                        for adb_id, idx in list(self.active_emulators.items()):
-                            if idx == str(emulator_index):
-                                del self.active_emulators[adb_id]
+        while True:
+            self._invalidate_list_cache()
+            emu = self.get_emulator(emulator_index)
+            if emu is not None and emu["status"] == "stopped":
+                return True
 
-                        return True
+            if time.time() - start_time >= max_wait_time:
+                break
 
-                logger.debug(f"Ожидание остановки эмулятора {emulator_index}, попытка {attempt + 1}/{max_attempts}")
+            logger.debug(f"Ожидание остановки эмулятора {emulator_index}, прошло {time.time() - start_time:.1f}с")
+            time.sleep(check_interval)
+            check_interval = min(2.0, check_interval * 1.5)
 
-            logger.error(f"Не удалось остановить эмулятор {emulator_index} после {max_attempts} попыток")
-            return False
+        logger.error(f"Не удалось остановить эмулятор {emulator_index} после {max_wait_time}с ожидания")
+        return False
+
+    def _cleanup_active(self, emulator_index: int) -> None:
+        """
+        Удаление остановленного эмулятора из словаря активных эмуляторов.
+
+        Args:
+            emulator_index: Индекс эмулятора
+        """
+        self._forget_adb_ids([str(emulator_index)])
 
     def restart_emulator(self, emulator_index: int) -> bool:
         """
         Перезапуск эмулятора LDPlayer.
+        Блокировки берут сами операции остановки и запуска, пауза между ними выполняется без блокировки.
 
         Args:
             emulator_index: Индекс эмулятора
@@ -396,24 +869,23 @@ class EmulatorManager:
         Returns:
             True если эмулятор перезапущен успешно, иначе False
         """
-        with self._lock:
-            logger.info(f"Перезапуск эмулятора с индексом {emulator_index}")
+        logger.info(f"Перезапуск эмулятора с индексом {emulator_index}")
 
-            # Останавливаем эмулятор
-            if not self.stop_emulator(emulator_index):
-                logger.error(f"Не удалось остановить эмулятор {emulator_index} для перезапуска")
-                return False
+        # Останавливаем эмулятор
+        if not self.stop_emulator(emulator_index):
+            logger.error(f"Не удалось остановить эмулятор {emulator_index} для перезапуска")
+            return False
 
-            # Ждем 5 секунд
-            time.sleep(5)
+        # Ждем 5 секунд
+        time.sleep(5)
 
-            # Запускаем эмулятор
-            if not self.start_emulator(emulator_index):
-                logger.error(f"Не удалось запустить эмулятор {emulator_index} после остановки")
-                return False
+        # Запускаем эмулятор
+        if not self.start_emulator(emulator_index):
+            logger.error(f"Не удалось запустить эмулятор {emulator_index} после остановки")
+            return False
 
-            logger.info(f"Эмулятор {emulator_index} успешно перезапущен")
-            return True
+        logger.info(f"Эмулятор {emulator_index} успешно перезапущен")
+        return True
 
     def install_app(self, emulator_index: int, apk_path: str) -> bool:
         """
@@ -426,20 +898,22 @@ class EmulatorManager:
         Returns:
             True если приложение установлено успешно, иначе False
         """
-        with self._lock:
-            if not os.path.exists(apk_path):
-                logger.error(f"APK файл не найден: {apk_path}")
-                return False
+        if not os.path.exists(apk_path):
+            logger.error(f"APK файл не найден: {apk_path}")
+            return False
 
-            logger.info(f"Установка приложения {apk_path} на эмулятор {emulator_index}")
-            result = self.execute_ldconsole(f"installapp --index {emulator_index} --filename \"{apk_path}\"")
+        logger.info(f"Установка приложения {apk_path} на эмулятор {emulator_index}")
+        result = self.execute_ldconsole_bytes(
+            ["installapp", "--index", str(emulator_index), "--filename", apk_path],
+            timeout=LDCONSOLE_INSTALL_TIMEOUT
+        ).decode('utf-8', errors='ignore').strip()
 
-            if "success" in result.lower():
-                logger.info(f"Приложение успешно установлено на эмулятор {emulator_index}")
-                return True
-            else:
-                logger.error(f"Ошибка установки приложения на эмулятор {emulator_index}: {result}")
-                return False
+        if "success" in result.lower():
+            logger.info(f"Приложение успешно установлено на эмулятор {emulator_index}")
+            return True
+        else:
+            logger.error(f"Ошибка установки приложения на эмулятор {emulator_index}: {result}")
+            return False
 
     def is_emulator_running(self, emulator_index: int) -> bool:
         """
@@ -451,11 +925,8 @@ class EmulatorManager:
         Returns:
             True если эмулятор запущен, иначе False
         """
-        emulators = self.list_emulators()
-        for emu in emulators:
-            if emu["index"] == str(emulator_index) and emu["status"] == "running":
-                return True
-        return False
+        emu = self.get_emulator(emulator_index)
+        return emu is not None and emu["status"] == "running"
 
     def is_emulator_responsive(self, emulator_index: int) -> bool:
         """
@@ -482,10 +953,10 @@ class EmulatorManager:
         try:
             # Пытаемся выполнить простую ADB команду
             result = subprocess.run(
-                f"adb -s {adb_id} shell dumpsys window",
-                shell=True,
-                capture_output=True,
-                text=True,
+                ["adb", "-s", adb_id, "shell", "dumpsys", "window"],
+                stdout=subprocess.DEVNULL,  # Важен только код возврата
+                stderr=subprocess.DEVNULL,
+                creationflags=_NO_WINDOW,
                 timeout=5
             )
 
@@ -503,6 +974,27 @@ class EmulatorManager:
             logger.error(f"Ошибка при проверке эмулятора {emulator_index}: {e}")
             return False
 
+    def check_many_responsive(self, indices: List[int]) -> Dict[int, bool]:
+        """
+        Параллельная проверка, отвечают ли эмуляторы на команды.
+
+        Args:
+            indices: Список индексов эмуляторов
+
+        Returns:
+            Словарь {индекс эмулятора: True если эмулятор отвечает, иначе False}
+        """
+        futures = {self._adb_pool.submit(self.is_emulator_responsive, index): index for index in indices}
+        results = {}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error(f"Ошибка при проверке эмулятора {index}: {e}")
+                results[index] = False
+        return results
+
     def restart_if_unresponsive(self, emulator_index: int, check_interval: int = 30) -> bool:
         """
         Перезапуск эмулятора, если он не отвечает на команды.
@@ -528,12 +1020,50 @@ class EmulatorManager:
             except Exception as e:
                 logger.error(f"Ошибка при остановке эмулятора {emulator_index}: {e}")
 
-        # Ждем некоторое время
-        time.sleep(5)
+        self._invalidate_list_cache()
+
+        # Если ldconsole сам завис и эмулятор не остановился, завершаем его процессы напрямую
+        if not self._await_stopped(emulator_index, max_wait_time=5):
+            self._force_kill_emulator(emulator_index)
 
         # Пытаемся перезапустить эмулятор
         return self.restart_emulator(emulator_index)
 
+    def _force_kill_emulator(self, emulator_index: int) -> bool:
+        """
+        Принудительное завершение процесса dnplayer.exe эмулятора вместе с дочерними процессами
+        (используется, когда эмулятор не останавливается через ldconsole).
+
+        Args:
+            emulator_index: Индекс эмулятора
+
+        Returns:
+            True если процесс эмулятора найден и завершен, иначе False
+        """
+        import psutil
+
+        killed = False
+
+        for proc in psutil.process_iter(['name', 'cmdline']):
+            try:
+                if (proc.info['name'] or "").lower() != "dnplayer.exe":
+                    continue
+                if not _cmdline_has_index(proc.info['cmdline'] or [], emulator_index):
+                    continue
+
+                logger.warning(f"Принудительное завершение процесса эмулятора {emulator_index} (PID {proc.pid})")
+                for child in proc.children(recursive=True):
+                    child.kill()
+                proc.kill()
+                killed = True
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.error(f"Не удалось завершить процесс эмулятора {emulator_index}: {e}")
+
+        if not killed:
+            logger.error(f"Процесс эмулятора {emulator_index} не найден")
+        self._invalidate_list_cache()
+        return killed
+
     def start_emulator_with_params(self, emulator_index: int, params: dict = None) -> bool:
         """
         Запуск эмулятора с определенными параметрами.
@@ -548,30 +1078,243 @@ class EmulatorManager:
         params = params or {}
 
         # Проверяем, не запущен ли уже эмулятор
-        if self.is_emulator_running(emulator_index):
+        if self._is_running_fast(emulator_index):
             logger.info(f"Эмулятор {emulator_index} уже запущен")
             return True
 
         # Формируем команду запуска с параметрами
-        cmd = f"launch --index {emulator_index}"
+        cmd = ["launch", "--index", str(emulator_index)]
 
         # Добавляем параметры
         for param, value in params.items():
-            cmd += f" --{param} {value}"
+            cmd += [f"--{param}", str(value)]
 
         # Запускаем эмулятор
         result = self.execute_ldconsole(cmd)
+        self._invalidate_list_cache()
 
-        # Ждем запуска эмулятора
-        max_attempts = 30
-        for attempt in range(max_attempts):
-            time.sleep(2)  # Ждем 2 секунды между проверками
+        # Ждем запуска эмулятора: первая проверка сразу после команды, затем с нарастающим интервалом
+        start_time = time.time()
+        max_wait_time = 60  # Максимальное время ожидания в секундах
+        check_interval = 0.2  # Начальный интервал проверки, растет до 2 секунд
 
+        while True:
+            self._invalidate_list_cache()
             if self.is_emulator_running(emulator_index):
                 logger.info(f"Эмулятор {emulator_index} успешно запущен с параметрами: {params}")
                 return True
 
-            logger.debug(f"Ожидание запуска эмулятора {emulator_index}, попытка {attempt + 1}/{max_attempts}")
+            if time.time() - start_time >= max_wait_time:
+                break
+
+            logger.debug(f"Ожидание запуска эмулятора {emulator_index}, прошло {time.time() - start_time:.1f}с")
+            time.sleep(check_interval)
+            check_interval = min(2.0, check_interval * 1.5)
+
+        logger.error(f"Не удалось запустить эмулятор {emulator_index} после {max_wait_time}с ожидания")
+        return False
+
+    # Асинхронные варианты операций: позволяют ожидать запуск и остановку многих эмуляторов
+    # в одном цикле событий, не занимая отдельный поток на каждый эмулятор
+
+    async def _exec_ldconsole(self, *args: str, timeout: float = LDCONSOLE_TIMEOUT) -> bytes:
+        """
+        Асинхронное выполнение команды ldconsole.
+
+        Args:
+            *args: Аргументы команды ldconsole
+            timeout: Таймаут в секундах
+
+        Returns:
+            Вывод команды (пустые байты при ошибке)
+        """
+        if not self._ldconsole_valid:
+            logger.error(f"Путь к ldconsole.exe не установлен или неверный: {self.ldconsole_path}")
+            return b""
+
+        argv = self._ldc_argv_prefix + list(args)
+        logger.debug(f"Асинхронное выполнение команды LDConsole: {argv}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                creationflags=_NO_WINDOW
+            )
+        except Exception as e:
+            logger.error(f"Непредвиденная ошибка при выполнении команды LDConsole: {e}")
+            return b""
+
+        try:
+            out, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            return out
+        except asyncio.TimeoutError:
+            proc.kill()
+            logger.error(f"Таймаут выполнения команды LDConsole: {argv}")
+            return b""
+
+    async def list_emulators_async(self) -> List[Dict[str, str]]:
+        """
+        Асинхронное получение списка всех эмуляторов LDPlayer (использует общий кэш с list_emulators).
+
+        Returns:
+            Список эмуляторов [{"index", "name", "status"}, ...]
+        """
+        cache = self._list_cache
+        if cache is not None and time.monotonic() - cache[0] < self._list_ttl:
+            return cache[1]
+
+        # Если список уже запрашивается в другой задаче, дожидаемся ее результата
+        inflight = self._list_inflight_async
+        if inflight is not None and not inflight.done():
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._list_inflight_async = future
+        try:
+            emulators = self._parse_list2(await self._exec_ldconsole("list2"))
+            logger.info(f"Найдено {len(emulators)} эмуляторов")
+            self._store_list_cache(emulators)
+            future.set_result(emulators)
+            return emulators
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._list_inflight_async = None
+
+    async def is_emulator_running_async(self, emulator_index: int) -> bool:
+        """
+        Асинхронная проверка, запущен ли эмулятор.
+
+        Args:
+            emulator_index: Индекс эмулятора
+
+        Returns:
+            True если эмулятор запущен, иначе False
+        """
+        await self.list_emulators_async()
+        emu = self._by_index.get(str(emulator_index))
+        return emu is not None and emu["status"] == "running"
+
+    async def _wait_for_status_async(self, emulator_index: int, status: str, max_wait_time: float) -> bool:
+        """
+        Асинхронное ожидание заданного статуса эмулятора с нарастающим интервалом проверки.
+
+        Args:
+            emulator_index: Индекс эмулятора
+            status: Ожидаемый статус ("running" или "stopped")
+            max_wait_time: Максимальное время ожидания в секундах
+
+        Returns:
+            True если статус достигнут, иначе False
+        """
+        deadline = time.monotonic() + max_wait_time
+        check_interval = 0.2  # Начальный интервал проверки, растет до 2 секунд
+
+        while True:
+            self._invalidate_list_cache()
+            if (await self.is_emulator_running_async(emulator_index)) == (status == "running"):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(check_interval)
+            check_interval = min(2.0, check_interval * 1.5)
+
+    async def start_emulator_async(self, emulator_index: int, max_wait_time: float = 30.0) -> bool:
+        """
+        Асинхронный запуск эмулятора LDPlayer по его индексу.
+
+        Args:
+            emulator_index: Индекс эмулятора
+            max_wait_time: Максимальное время ожидания запуска в секундах
+
+        Returns:
+            True если эмулятор запущен успешно, иначе False
+        """
+        if await self.is_emulator_running_async(emulator_index):
+            logger.info(f"Эмулятор {emulator_index} уже запущен")
+            return True
+
+        logger.info(f"Запуск эмулятора с индексом {emulator_index}")
+        await self._exec_ldconsole("launch", "--index", str(emulator_index), timeout=5)
 
-        logger.error(f"Не удалось запустить эмулятор {emulator_index} после {max_attempts} попыток")
+        if await self._wait_for_status_async(emulator_index, "running", max_wait_time):
+            logger.info(f"Эмулятор {emulator_index} успешно запущен")
+            return True
+
+        logger.error(f"Не удалось запустить эмулятор {emulator_index} после {max_wait_time}с ожидания")
         return False
+
+    async def stop_emulator_async(self, emulator_index: int, max_wait_time: float = 15.0) -> bool:
+        """
+        Асинхронная остановка эмулятора LDPlayer по его индексу.
+
+        Args:
+            emulator_index: Индекс эмулятора
+            max_wait_time: Максимальное время ожидания остановки в секундах
+
+        Returns:
+            True если эмулятор остановлен успешно, иначе False
+        """
+        if not await self.is_emulator_running_async(emulator_index):
+            logger.info(f"Эмулятор {emulator_index} уже остановлен")
+            return True
+
+        logger.info(f"Остановка эмулятора с индексом {emulator_index}")
+        await self._exec_ldconsole("quit", "--index", str(emulator_index), timeout=5)
+
+        if not await self._wait_for_status_async(emulator_index, "stopped", max_wait_time):
+            logger.error(f"Не удалось остановить эмулятор {emulator_index} за {max_wait_time}с")
+            return False
+
+        logger.info(f"Эмулятор {emulator_index} успешно остановлен")
+        self._cleanup_active(emulator_index)
+        return True
+
+    async def is_emulator_responsive_async(self, emulator_index: int) -> bool:
+        """
+        Асинхронная проверка, отвечает ли эмулятор на команды.
+
+        Args:
+            emulator_index: Индекс эмулятора
+
+        Returns:
+            True если эмулятор отвечает, иначе False
+        """
+        if not await self.is_emulator_running_async(emulator_index):
+            logger.warning(f"Эмулятор {emulator_index} не запущен")
+            return False
+
+        # Поиск ADB ID может обращаться к ldconsole, выполняем его в пуле потоков
+        loop = asyncio.get_running_loop()
+        adb_id = await loop.run_in_executor(self._pool, self.get_emulator_adb_id, emulator_index)
+        if not adb_id:
+            logger.error(f"Не удалось получить ADB ID для эмулятора {emulator_index}")
+            return False
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "adb", "-s", adb_id, "shell", "dumpsys", "window",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                creationflags=_NO_WINDOW
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при проверке эмулятора {emulator_index}: {e}")
+            return False
+
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            logger.warning(f"Таймаут при выполнении команды для эмулятора {emulator_index}")
+            return False
+
+        if returncode != 0:
+            logger.warning(f"Эмулятор {emulator_index} не отвечает на ADB команды")
+            return False
+        return True
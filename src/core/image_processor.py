@@ -1,6 +1,12 @@
 import os
+import json
+import zlib
+import time
+import threading
 import cv2
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, List, Dict, Any, Union
 from pathlib import Path
 from ..utils.logger import get_logger
@@ -8,6 +14,306 @@ from ..utils.exceptions import ImageError
 
 logger = get_logger(__name__)
 
+# numba необязателен: без него дубликаты подавляются векторно средствами NumPy
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# pytesseract необязателен: нужен только для распознавания текста (сезоны, серверы)
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# tesserocr необязателен: держит Tesseract загруженным в процессе вместо запуска pytesseract на каждый вызов
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# CUDA: если OpenCV собран с модулем cudaimgproc и есть устройство, сопоставление идет на GPU
+try:
+    CUDA_AVAILABLE = (cv2.cuda.getCudaEnabledDeviceCount() > 0 and
+                      hasattr(cv2.cuda, "createTemplateMatching"))
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+CUDA_UPLOAD_CACHE_SIZE = 8  # Сколько изображений держать загруженными на устройстве (на поток)
+
+# OpenCL (T-API): при наличии устройства matchTemplate выполняется через cv2.UMat
+OPENCL_AVAILABLE = cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(OPENCL_AVAILABLE)
+
+# Кэш декодированных шаблонов: один .npy-файл, открываемый через mmap всеми процессами бота
+TEMPLATE_CACHE_DATA = "_templates_cache.npy"
+TEMPLATE_CACHE_MANIFEST = "_templates_cache.json"
+
+# Проверка прошлой позиции шаблона по разностному хэшу (dHash, 64 бита)
+DHASH_MAX_DISTANCE = 16  # Допустимое число отличающихся бит
+
+# Параметры пирамидального поиска (coarse-to-fine)
+PYRAMID_MAX_LEVEL = 3  # Максимальная глубина пирамиды (уменьшение до 8 раз)
+PYRAMID_MIN_TEMPLATE_SIZE = 16  # Минимальная сторона шаблона на верхнем уровне
+PYRAMID_THRESHOLD_RELAX = 0.15  # Ослабление порога при поиске кандидата на грубом уровне
+PYRAMID_MAX_CANDIDATES = 5  # Сколько пиков грубого уровня уточняется в полном разрешении
+
+# Пакетное распознавание: области складываются в одно изображение и передаются в Tesseract один раз
+OCR_REGION_GAP = 20  # Высота полосы фона между областями в составном изображении
+
+# Ожидание шаблона: первые проверки идут чаще, пауза удваивается до interval
+WAIT_INITIAL_DELAY = 0.05  # Первая пауза между проверками в секундах
+
+
+def _gpu_upload(image: np.ndarray) -> Any:
+    """
+    Загрузка изображения в память CUDA-устройства.
+
+    Args:
+        image: Изображение
+
+    Returns:
+        cv2.cuda_GpuMat с копией изображения
+    """
+    gpu_image = cv2.cuda_GpuMat()
+    gpu_image.upload(image)
+    return gpu_image
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """
+    Преобразование изображения в оттенки серого (одноканальные изображения возвращаются как есть).
+
+    Args:
+        image: Изображение BGR, BGRA или полутоновое
+
+    Returns:
+        Одноканальное изображение uint8
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _greedy_nms_kernel(xs: np.ndarray, ys: np.ndarray, half_ws: np.ndarray, half_hs: np.ndarray,
+                       order: np.ndarray, max_results: int) -> np.ndarray:
+    """
+    Тот же жадный отбор, что и в _suppress_duplicates, в виде простого цикла
+    по массивам int32 - для компиляции numba.
+
+    Args:
+        xs, ys: Координаты кандидатов
+        half_ws, half_hs: Половины размеров шаблона для каждого кандидата
+        order: Индексы кандидатов по убыванию сходства
+        max_results: Максимальное количество результатов
+
+    Returns:
+        Индексы оставленных кандидатов
+    """
+    keep = np.empty(max(0, min(order.size, max_results)), dtype=np.int64)
+    count = 0
+
+    for j in order:
+        if count >= keep.size:
+            break
+
+        duplicate = False
+        for k in range(count):
+            i = keep[k]
+            if abs(xs[j] - xs[i]) < half_ws[j] and abs(ys[j] - ys[i]) < half_hs[j]:
+                duplicate = True
+                break
+
+        if not duplicate:
+            keep[count] = j
+            count += 1
+
+    return keep[:count]
+
+
+_greedy_nms_jit = numba.njit(cache=True)(_greedy_nms_kernel) if numba is not None else None
+
+
+def _suppress_duplicates(xs: np.ndarray, ys: np.ndarray, ws: np.ndarray, hs: np.ndarray,
+                         scores: np.ndarray, max_results: int) -> List[int]:
+    """
+    Жадное подавление дубликатов: кандидаты берутся по убыванию сходства, а все
+    оставшиеся ближе половины своего размера к выбранному отбрасываются одной
+    векторной операцией. Без numba полная сортировка не строится: на каждом шаге
+    берётся максимум, а подавленные кандидаты помечаются как -inf.
+
+    Args:
+        xs, ys: Координаты кандидатов
+        ws, hs: Размеры шаблона для каждого кандидата
+        scores: Значения сходства
+        max_results: Максимальное количество результатов
+
+    Returns:
+        Индексы оставленных кандидатов в порядке убывания сходства
+    """
+    half_w = ws // 2
+    half_h = hs // 2
+
+    if _greedy_nms_jit is not None:
+        order = np.argsort(-scores, kind="stable")
+        keep = _greedy_nms_jit(xs.astype(np.int32), ys.astype(np.int32),
+                               half_w.astype(np.int32), half_h.astype(np.int32),
+                               order, max_results)
+        return keep.tolist()
+
+    remaining = scores.astype(np.float64, copy=True)
+    keep = []
+
+    while len(keep) < max_results:
+        best = int(np.argmax(remaining))
+        if remaining[best] == -np.inf:
+            break
+        keep.append(best)
+
+        # Если точки близки друг к другу, считаем их дубликатами
+        duplicate = ((np.abs(xs - xs[best]) < half_w) &
+                     (np.abs(ys - ys[best]) < half_h))
+        remaining[duplicate] = -np.inf
+        remaining[best] = -np.inf
+
+    return keep
+
+
+def _dhash(gray: np.ndarray) -> int:
+    """
+    Разностный хэш изображения: знак перепада яркости между соседними
+    пикселями уменьшенной до 9x8 копии.
+
+    Args:
+        gray: Полутоновое изображение
+
+    Returns:
+        64-битный хэш
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _frame_digest(image: np.ndarray) -> int:
+    """
+    Контрольная сумма кадра для пропуска повторного поиска на неизменившемся экране.
+    CRC32 всего кадра (~1 мс на 1080p) дешевле уменьшенной копии и не пропускает мелкие изменения.
+
+    Args:
+        image: Изображение-скриншот
+
+    Returns:
+        CRC32 данных кадра
+    """
+    return zlib.crc32(np.ascontiguousarray(image))
+
+
+def _ncc_same_size(image: np.ndarray, template: np.ndarray) -> float:
+    """
+    Нормированная корреляция (как TM_CCOEFF_NORMED) для изображения и шаблона
+    одинакового размера: одно скалярное произведение вместо общего ядра matchTemplate.
+
+    Args:
+        image: Изображение (область скриншота)
+        template: Шаблон того же размера и с тем же числом каналов
+
+    Returns:
+        Коэффициент корреляции от -1.0 до 1.0
+    """
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    a = image.reshape(-1, channels).astype(np.float32)
+    b = template.reshape(-1, channels).astype(np.float32)
+
+    # Как и в OpenCV, среднее вычитается по каждому каналу отдельно
+    a -= a.mean(axis=0)
+    b -= b.mean(axis=0)
+    a, b = a.ravel(), b.ravel()
+
+    denominator = float(np.sqrt(float(np.dot(a, a)) * float(np.dot(b, b))))
+    return float(np.dot(a, b)) / denominator if denominator > 0 else 0.0
+
+
+def _peak(result: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+    """
+    Максимум карты сходства и его положение (один проход argmax вместо cv2.minMaxLoc).
+
+    Args:
+        result: Карта сходства
+
+    Returns:
+        Кортеж (максимальное значение, (x, y))
+    """
+    flat_idx = int(result.argmax())
+    y, x = divmod(flat_idx, result.shape[1])
+    return float(result.flat[flat_idx]), (x, y)
+
+
+def _coarse_peaks(result: np.ndarray,
+                  min_val: float,
+                  half_w: int,
+                  half_h: int,
+                  max_peaks: int) -> List[Tuple[float, Tuple[int, int]]]:
+    """
+    Несколько лучших пиков карты сходства не ниже min_val: после выбора пика его
+    окрестность размером с шаблон исключается, чтобы следующий пик был другим местом.
+    Карта изменяется на месте.
+
+    Args:
+        result: Карта сходства
+        min_val: Минимальное значение пика
+        half_w, half_h: Половина размера шаблона на этом уровне
+        max_peaks: Максимальное количество пиков
+
+    Returns:
+        Список (значение, (x, y)) по убыванию значения
+    """
+    peaks = []
+    while len(peaks) < max_peaks:
+        max_val, (x, y) = _peak(result)
+        if max_val < min_val:
+            break
+        peaks.append((max_val, (x, y)))
+        result[max(0, y - half_h):y + half_h + 1, max(0, x - half_w):x + half_w + 1] = -np.inf
+    return peaks
+
+
+def _pyramid_depth(height: int, width: int) -> int:
+    """
+    Глубина пирамиды для шаблона заданного размера: шаблон уменьшается вдвое,
+    пока его меньшая сторона остается не меньше PYRAMID_MIN_TEMPLATE_SIZE.
+
+    Args:
+        height: Высота шаблона
+        width: Ширина шаблона
+
+    Returns:
+        Количество уровней уменьшения (0 - поиск только в полном разрешении)
+    """
+    depth = 0
+    while (depth < PYRAMID_MAX_LEVEL and
+           min(height, width) >> (depth + 1) >= PYRAMID_MIN_TEMPLATE_SIZE):
+        depth += 1
+    return depth
+
+
+def _extend_pyramid(levels: List[np.ndarray], depth: int) -> List[np.ndarray]:
+    """
+    Достраивание гауссовой пирамиды до нужной глубины.
+
+    Args:
+        levels: Уже построенные уровни (levels[0] - исходное изображение)
+        depth: Требуемое количество уровней уменьшения
+
+    Returns:
+        Тот же список, дополненный уровнями cv2.pyrDown
+    """
+    while len(levels) <= depth:
+        levels.append(cv2.pyrDown(levels[-1]))
+    return levels
+
 
 class ImageProcessor:
     """
@@ -23,8 +329,25 @@ class ImageProcessor:
             assets_path: Путь к директории с изображениями-шаблонами
         """
         self.assets_path = Path(assets_path)
-        self.templates = {}  # Кэш для шаблонов
+        self.templates = OrderedDict()  # LRU-кэш шаблонов (давно не использованные вытесняются)
+        self._max_templates = 128  # Максимальное количество шаблонов в памяти
+        self._template_views = {}  # Представления шаблонов в mmap-кэше для повторной загрузки
+        # Размеры шаблонов в виде массивов (SoA) для векторного отбора кандидатов
+        self._names = []
+        self._name_index = {}
+        self._widths = np.empty(0, dtype=np.int32)
+        self._heights = np.empty(0, dtype=np.int32)
+        self._table_dirty = True
         self.template_info = {}  # Информация о шаблонах (размеры, особенности и т.д.)
+        self.templates_gray = {}  # Полутоновые копии шаблонов для стандартного поиска
+        self.templates_pyr = {}  # Гауссовы пирамиды полутоновых шаблонов [уровень 0, уровень 1, ...]
+        self.templates_pyr_dev = {}  # Те же пирамиды в памяти устройства (cv2.cuda_GpuMat или cv2.UMat)
+        self._scaled_cache = {}  # Масштабированные пирамиды шаблонов: имя -> {(полутоновый, масштаб): уровни}
+        self.use_cuda = CUDA_AVAILABLE
+        self.use_opencl = OPENCL_AVAILABLE and not self.use_cuda
+        self._local = threading.local()  # Буферы карт сходства свои у каждого потока
+        self._templates_lock = threading.Lock()  # Защита LRU-кэша при поиске из нескольких потоков
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="template-search")
         self._load_templates()
 
         # Словарь с оптимальными порогами для разных типов шаблонов
@@ -52,6 +375,10 @@ class ImageProcessor:
             "open_new_local_building": 0.82
         }
 
+        # Шаблоны, которые различаются только цветом (например, активная и неактивная кнопка):
+        # по умолчанию они ищутся в BGR, остальные - в оттенках серого
+        self.color_templates = set()
+
         # Настройки для разных разрешений
         self.resolution_map = {
             (1920, 1080): {"scale_factor": 1.0},  # Базовое разрешение
@@ -76,39 +403,493 @@ class ImageProcessor:
             logger.error(f"Директория с изображениями не найдена: {self.assets_path}")
             return
 
-        for file_path in self.assets_path.glob("*.png"):
-            template_name = file_path.stem
-            template_img = cv2.imread(str(file_path))
-
-            if template_img is not None:
-                # Сохраняем шаблон
-                self.templates[template_name] = template_img
-
-                # Анализируем и сохраняем информацию о шаблоне
-                height, width = template_img.shape[:2]
-                aspect_ratio = width / height if height > 0 else 0
-
-                # Вычисляем дополнительные характеристики шаблона
-                gray = cv2.cvtColor(template_img, cv2.COLOR_BGR2GRAY)
-                features = {
-                    "size": (width, height),
-                    "aspect_ratio": aspect_ratio,
-                    "mean_color": np.mean(template_img, axis=(0, 1)).tolist(),
-                    "edges": cv2.Canny(gray, 100, 200),
-                    "histogram": cv2.calcHist([gray], [0], None, [16], [0, 256]).flatten().tolist(),
-                    "mask": None  # Маска будет создана при необходимости
-                }
-
-                # Если шаблон имеет прозрачность (4 канала), создаем маску
-                if template_img.shape[2] == 4:
-                    alpha_channel = template_img[:, :, 3]
-                    features["mask"] = alpha_channel > 128
-
-                self.template_info[template_name] = features
-
-                logger.debug(f"Загружен шаблон: {template_name}, размер: {template_img.shape}")
-            else:
-                logger.error(f"Не удалось загрузить шаблон: {file_path}")
+        png_files = sorted(self.assets_path.glob("*.png"))
+        signature = [[file_path.name, os.path.getmtime(file_path), os.path.getsize(file_path)]
+                     for file_path in png_files]
+
+        # Теплый старт: шаблоны берутся из общего mmap-кэша без декодирования PNG
+        views = self._load_template_cache(signature)
+        if views is not None:
+            source = views
+            logger.debug(f"Шаблоны загружены из кэша {TEMPLATE_CACHE_DATA}: {len(views)}")
+        else:
+            decoded = {}
+            for file_path in png_files:
+                template_img = cv2.imread(str(file_path))
+
+                if template_img is not None:
+                    decoded[file_path.stem] = template_img
+                    logger.debug(f"Загружен шаблон: {file_path.stem}, размер: {template_img.shape}")
+                else:
+                    logger.error(f"Не удалось загрузить шаблон: {file_path}")
+
+            # Дальше работаем с mmap-представлением, чтобы память шаблонов делилась между процессами
+            self._save_template_cache(decoded, signature)
+            views = self._load_template_cache(signature)
+            source = views if views is not None else decoded
+
+        self._template_views = views or {}
+
+        # В память сразу попадают не больше _max_templates шаблонов, остальные - по запросу
+        for template_name in list(source)[:self._max_templates]:
+            self._register_template(template_name, source[template_name])
+
+    def _load_template_cache(self, signature: List[List[Any]]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Открытие кэша шаблонов через mmap, если он соответствует текущим PNG-файлам.
+
+        Args:
+            signature: Список [имя файла, время изменения, размер] для всех PNG-файлов
+
+        Returns:
+            Словарь {имя_шаблона: массив только для чтения} или None, если кэш отсутствует или устарел
+        """
+        manifest_path = self.assets_path / TEMPLATE_CACHE_MANIFEST
+        data_path = self.assets_path / TEMPLATE_CACHE_DATA
+        if not manifest_path.exists() or not data_path.exists():
+            return None
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+
+            if manifest.get("signature") != signature:
+                logger.debug("Кэш шаблонов устарел, шаблоны будут загружены из PNG")
+                return None
+
+            data = np.load(data_path, mmap_mode="r")
+            templates = {}
+            for template_name, entry in manifest["templates"].items():
+                offset = entry["offset"]
+                shape = tuple(entry["shape"])
+                templates[template_name] = data[offset:offset + int(np.prod(shape))].reshape(shape)
+            return templates
+
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать кэш шаблонов: {e}")
+            return None
+
+    def _save_template_cache(self, decoded: Dict[str, np.ndarray], signature: List[List[Any]]) -> None:
+        """
+        Сохранение декодированных шаблонов в один .npy-файл с JSON-манифестом (имя -> смещение, размер).
+
+        Args:
+            decoded: Словарь {имя_шаблона: изображение}
+            signature: Список [имя файла, время изменения, размер] для всех PNG-файлов
+        """
+        if not decoded:
+            return
+
+        entries = {}
+        offset = 0
+        for template_name, template_img in decoded.items():
+            entries[template_name] = {"offset": offset, "shape": list(template_img.shape)}
+            offset += template_img.size
+
+        data = np.concatenate([template_img.ravel() for template_img in decoded.values()])
+        data_path = self.assets_path / TEMPLATE_CACHE_DATA
+        manifest_path = self.assets_path / TEMPLATE_CACHE_MANIFEST
+
+        try:
+            # Пишем во временные файлы и подменяем атомарно, чтобы другие процессы не прочитали половину;
+            # имена уникальны для процесса и потока: кэш могут одновременно сохранять несколько ботов
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_data = data_path.with_name(data_path.name + suffix)
+            tmp_manifest = manifest_path.with_name(manifest_path.name + suffix)
+            try:
+                with open(tmp_data, "wb") as f:
+                    np.save(f, data)
+                os.replace(tmp_data, data_path)
+
+                with open(tmp_manifest, "w", encoding="utf-8") as f:
+                    json.dump({"signature": signature, "templates": entries}, f, indent=4, ensure_ascii=False)
+                os.replace(tmp_manifest, manifest_path)
+            finally:
+                for tmp_path in (tmp_data, tmp_manifest):
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+
+            logger.debug(f"Кэш шаблонов сохранен: {data_path}")
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить кэш шаблонов: {e}")
+
+    def _register_template(self, template_name: str, template_img: np.ndarray) -> None:
+        """
+        Сохранение шаблона в кэше вместе с его полутоновой копией, пирамидой
+        и вычисленными характеристиками.
+
+        Args:
+            template_name: Имя шаблона
+            template_img: Изображение шаблона (BGR)
+        """
+        # Сохраняем шаблон, вытесняя давно не использованные сверх лимита
+        self.templates[template_name] = template_img
+        self.templates.move_to_end(template_name)
+        while len(self.templates) > self._max_templates:
+            self._evict_template(next(iter(self.templates)))
+        self._table_dirty = True
+
+        # Анализируем и сохраняем информацию о шаблоне
+        height, width = template_img.shape[:2]
+        aspect_ratio = width / height if height > 0 else 0
+
+        # Вычисляем дополнительные характеристики шаблона
+        # (границы и гистограмма считаются при первом обращении, см. _get_edges/_get_histogram)
+        gray = _to_gray(template_img)
+        features = {
+            "size": (width, height),
+            "aspect_ratio": aspect_ratio,
+            "mean_color": np.mean(template_img, axis=(0, 1)).tolist(),
+            "mask": None  # Маска будет создана при необходимости
+        }
+
+        # Если шаблон имеет прозрачность (4 канала), создаем маску
+        if template_img.ndim == 3 and template_img.shape[2] == 4:
+            alpha_channel = template_img[:, :, 3]
+            features["mask"] = alpha_channel > 128
+
+        self.template_info[template_name] = features
+
+        # Стандартный поиск идет по яркости: полутоновый шаблон и его пирамида
+        self.templates_gray[template_name] = gray
+        features["dhash"] = _dhash(gray)
+        self.templates_pyr[template_name] = self._build_template_pyramid(gray)
+
+        # Шаблоны остаются на устройстве, чтобы не копировать их при каждом опросе
+        template_dev = self._upload_levels(self.templates_pyr[template_name])
+        if template_dev is not None:
+            self.templates_pyr_dev[template_name] = template_dev
+        self._scaled_cache.pop(template_name, None)
+
+    def _get_edges(self, template_name: str) -> Optional[np.ndarray]:
+        """
+        Карта границ шаблона (Canny), вычисляемая при первом запросе.
+
+        Args:
+            template_name: Имя шаблона
+
+        Returns:
+            Бинарное изображение границ или None, если шаблон не найден
+        """
+        if self._get_template(template_name) is None:
+            return None
+
+        features = self.template_info[template_name]
+        if "edges" not in features:
+            features["edges"] = cv2.Canny(self.templates_gray[template_name], 100, 200)
+        return features["edges"]
+
+    def _get_histogram(self, template_name: str) -> Optional[List[float]]:
+        """
+        Гистограмма яркости шаблона (16 интервалов), вычисляемая при первом запросе.
+
+        Args:
+            template_name: Имя шаблона
+
+        Returns:
+            Список значений гистограммы или None, если шаблон не найден
+        """
+        if self._get_template(template_name) is None:
+            return None
+
+        features = self.template_info[template_name]
+        if "histogram" not in features:
+            gray = self.templates_gray[template_name]
+            features["histogram"] = cv2.calcHist([gray], [0], None, [16], [0, 256]).flatten().tolist()
+        return features["histogram"]
+
+    def _evict_template(self, template_name: str) -> None:
+        """
+        Удаление шаблона и всех производных данных из памяти.
+
+        Args:
+            template_name: Имя шаблона
+        """
+        for cache in (self.templates, self.template_info, self.templates_gray,
+                      self.templates_pyr, self.templates_pyr_dev, self._scaled_cache):
+            cache.pop(template_name, None)
+        self._table_dirty = True
+        logger.debug(f"Шаблон {template_name} вытеснен из кэша")
+
+    def _template_table(self) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """
+        Таблица размеров загруженных шаблонов в виде отдельных массивов;
+        перестраивается только после загрузки или вытеснения шаблона.
+
+        Returns:
+            Кортеж (индекс по имени, массив ширин, массив высот)
+        """
+        if self._table_dirty:
+            self._names = list(self.templates)
+            self._name_index = {name: i for i, name in enumerate(self._names)}
+            shapes = np.array([self.templates[name].shape[:2] for name in self._names],
+                              dtype=np.int32).reshape(-1, 2)
+            self._heights = shapes[:, 0].copy()
+            self._widths = shapes[:, 1].copy()
+            self._table_dirty = False
+        return self._name_index, self._widths, self._heights
+
+    def _get_template(self, template_name: str) -> Optional[np.ndarray]:
+        """
+        Получение шаблона из LRU-кэша; отсутствующий шаблон загружается из mmap-кэша
+        или с диска.
+
+        Args:
+            template_name: Имя шаблона (без расширения)
+
+        Returns:
+            Изображение шаблона (BGR) или None, если шаблон не найден
+        """
+        with self._templates_lock:
+            template = self.templates.get(template_name)
+            if template is not None:
+                self.templates.move_to_end(template_name)
+                return template
+
+            template = self._template_views.get(template_name)
+            if template is None:
+                template_path = self.assets_path / f"{template_name}.png"
+                template = cv2.imread(str(template_path)) if template_path.exists() else None
+                if template is None:
+                    logger.error(f"Шаблон не найден: {template_name}")
+                    return None
+
+            self._register_template(template_name, template)
+            logger.debug(f"Загружен шаблон по запросу: {template_name}")
+            return template
+
+    def _scaled_template_levels(self,
+                                template_name: str,
+                                preprocess_type: str,
+                                scale: float) -> Optional[Tuple[List[np.ndarray], Optional[List[Any]]]]:
+        """
+        Пирамида шаблона в нужном масштабе. Шаблоны статичны, поэтому масштабированные
+        варианты строятся один раз и хранятся до вытеснения шаблона из кэша.
+
+        Args:
+            template_name: Имя загруженного шаблона
+            preprocess_type: Тип предобработки ("default" - полутоновый шаблон, иначе BGR)
+            scale: Коэффициент масштабирования
+
+        Returns:
+            Кортеж (уровни пирамиды, их копии на устройстве или None) или None,
+            если шаблон вытеснен из кэша другим потоком
+        """
+        gray = preprocess_type == "default"
+        key = (gray, round(scale, 3))
+        with self._templates_lock:
+            if gray and scale == 1.0:
+                levels = self.templates_pyr.get(template_name)
+                return None if levels is None else (levels, self.templates_pyr_dev.get(template_name))
+
+            cached = self._scaled_cache.get(template_name, {}).get(key)
+            if cached is not None:
+                return cached
+            base_template = (self.templates_gray if gray else self.templates).get(template_name)
+            if base_template is None:
+                return None
+
+        # Масштабирование выполняется вне блокировки, чтобы не задерживать другие потоки
+        levels = self._build_template_pyramid(self.scale_image(base_template, scale))
+        cached = (levels, self._upload_levels(levels))
+
+        with self._templates_lock:
+            # Шаблон могли вытеснить за время построения: его пирамиду не сохраняем
+            if template_name in self.templates:
+                self._scaled_cache.setdefault(template_name, {})[key] = cached
+        return cached
+
+    def _upload_levels(self, levels: List[np.ndarray]) -> Optional[List[Any]]:
+        """
+        Копирование уровней пирамиды шаблона на CUDA- или OpenCL-устройство.
+
+        Args:
+            levels: Уровни пирамиды
+
+        Returns:
+            Список cv2.cuda_GpuMat / cv2.UMat или None, если устройство не используется
+        """
+        if self.use_cuda:
+            return [_gpu_upload(level) for level in levels]
+        if self.use_opencl:
+            return [cv2.UMat(level) for level in levels]
+        return None
+
+    @staticmethod
+    def _build_template_pyramid(template: np.ndarray) -> List[np.ndarray]:
+        """
+        Построение пирамиды шаблона; глубина зависит от размера шаблона.
+
+        Args:
+            template: Изображение шаблона
+
+        Returns:
+            Список уровней пирамиды, начиная с исходного шаблона
+        """
+        height, width = template.shape[:2]
+        return _extend_pyramid([template], _pyramid_depth(height, width))
+
+    def _result_buffer(self, image_shape: Tuple[int, ...], template_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Получение заранее выделенной карты сходства для пары размеров скриншота и шаблона.
+
+        Args:
+            image_shape: Размер изображения (H, W, ...)
+            template_shape: Размер шаблона (h, w, ...)
+
+        Returns:
+            Массив float32 размером (H - h + 1, W - w + 1)
+        """
+        # Буферы хранятся по ключу (H, W, h, w) отдельно для каждого потока
+        buffers = getattr(self._local, "result_buffers", None)
+        if buffers is None:
+            buffers = self._local.result_buffers = {}
+
+        key = (image_shape[0], image_shape[1], template_shape[0], template_shape[1])
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = np.empty((key[0] - key[2] + 1, key[1] - key[3] + 1), dtype=np.float32)
+            buffers[key] = buffer
+        return buffer
+
+    def _match_template(self,
+                        image: np.ndarray,
+                        template: np.ndarray,
+                        template_dev: Any = None,
+                        reuse_buffer: bool = False) -> np.ndarray:
+        """
+        Вычисление карты сходства TM_CCOEFF_NORMED; при доступном CUDA или OpenCL
+        расчет выполняется на устройстве.
+
+        Args:
+            image: Изображение, в котором ищется шаблон
+            template: Шаблон
+            template_dev: Уже загруженная на устройство копия шаблона (cv2.cuda_GpuMat или cv2.UMat)
+            reuse_buffer: Записать результат в общий буфер (действителен до следующего вызова)
+
+        Returns:
+            Карта сходства (float32)
+        """
+        # Шаблон размером с изображение: карта сходства из одного значения
+        if image.shape == template.shape:
+            return np.array([[_ncc_same_size(image, template)]], dtype=np.float32)
+
+        if self.use_cuda:
+            return self._match_template_cuda(image, template, template_dev)
+
+        if not self.use_opencl:
+            if reuse_buffer:
+                result = self._result_buffer(image.shape, template.shape)
+                return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=result)
+            return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+
+        if template_dev is None:
+            template_dev = cv2.UMat(template)
+        return cv2.matchTemplate(cv2.UMat(image), template_dev, cv2.TM_CCOEFF_NORMED).get()
+
+    def _match_template_cuda(self, image: np.ndarray, template: np.ndarray, template_dev: Any = None) -> np.ndarray:
+        """
+        Сопоставление на CUDA-устройстве. Изображение загружается один раз
+        (повторные вызовы с тем же массивом используют уже загруженную копию),
+        сопоставители создаются один раз на поток и число каналов.
+
+        Args:
+            image: Изображение, в котором ищется шаблон
+            template: Шаблон
+            template_dev: Уже загруженная копия шаблона (cv2.cuda_GpuMat)
+
+        Returns:
+            Карта сходства (float32)
+        """
+        channels = 1 if image.ndim == 2 else image.shape[2]
+
+        matchers = getattr(self._local, "cuda_matchers", None)
+        if matchers is None:
+            matchers = self._local.cuda_matchers = {}
+        matcher = matchers.get(channels)
+        if matcher is None:
+            matcher = cv2.cuda.createTemplateMatching(cv2.CV_8UC(channels), cv2.TM_CCOEFF_NORMED)
+            matchers[channels] = matcher
+
+        # Уровни пирамиды кадра переиспользуются всеми шаблонами - держим их загруженными
+        uploads = getattr(self._local, "cuda_uploads", None)
+        if uploads is None:
+            uploads = self._local.cuda_uploads = {}
+        entry = uploads.get(id(image))
+        if entry is not None and entry[0] is image:
+            gpu_image = entry[1]
+        else:
+            if len(uploads) >= CUDA_UPLOAD_CACHE_SIZE:
+                uploads.clear()
+            gpu_image = _gpu_upload(image)
+            uploads[id(image)] = (image, gpu_image)
+
+        if template_dev is None:
+            template_dev = _gpu_upload(template)
+        return matcher.match(gpu_image, template_dev).download()
+
+    def _match_pyramid(self,
+                       screen_levels: List[np.ndarray],
+                       template_levels: List[np.ndarray],
+                       threshold: float,
+                       template_dev: Optional[List[Any]] = None) -> Tuple[float, Tuple[int, int]]:
+        """
+        Поиск шаблона от грубого уровня пирамиды к полному разрешению: кандидаты (до
+        PYRAMID_MAX_CANDIDATES пиков выше ослабленного порога) ищутся на верхнем уровне,
+        затем каждый уточняется в небольшой области исходного скриншота. На грубом уровне
+        размытая похожая область может обогнать точное совпадение, поэтому лучший
+        результат выбирается по сходству в полном разрешении.
+
+        Args:
+            screen_levels: Пирамида скриншота (должна быть не мельче пирамиды шаблона)
+            template_levels: Пирамида шаблона
+            threshold: Порог сходства
+            template_dev: Копия пирамиды шаблона на OpenCL-устройстве (если есть)
+
+        Returns:
+            Кортеж (лучшее сходство, (x, y) в координатах исходного скриншота)
+        """
+        level = len(template_levels) - 1
+
+        # На верхнем уровне шаблон должен помещаться в уменьшенный скриншот
+        while level > 0 and (template_levels[level].shape[0] > screen_levels[level].shape[0] or
+                             template_levels[level].shape[1] > screen_levels[level].shape[1]):
+            level -= 1
+
+        result = self._match_template(screen_levels[level], template_levels[level],
+                                      template_dev[level] if template_dev else None, reuse_buffer=True)
+        max_val, max_loc = _peak(result)
+
+        if level == 0:
+            return max_val, max_loc
+
+        # Кандидата нет даже с ослабленным порогом - уточнять нечего
+        if max_val < threshold - PYRAMID_THRESHOLD_RELAX:
+            return max_val, (max_loc[0] << level, max_loc[1] << level)
+
+        coarse_h, coarse_w = template_levels[level].shape[:2]
+        candidates = _coarse_peaks(result, threshold - PYRAMID_THRESHOLD_RELAX,
+                                   coarse_w // 2, coarse_h // 2, PYRAMID_MAX_CANDIDATES)
+
+        # Уточняем положение каждого кандидата в полном разрешении в окне вокруг него
+        screen = screen_levels[0]
+        h, w = template_levels[0].shape[:2]
+        pad = 2 << level
+        best_val, best_loc = -1.0, (max_loc[0] << level, max_loc[1] << level)
+
+        for _, (cx, cy) in candidates:
+            x, y = cx << level, cy << level
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            x1 = min(screen.shape[1], x + w + pad)
+            y1 = min(screen.shape[0], y + h + pad)
+
+            result = self._match_template(screen[y0:y1, x0:x1], template_levels[0],
+                                          template_dev[0] if template_dev else None)
+            val, loc = _peak(result)
+            if val > best_val:
+                best_val, best_loc = val, (x0 + loc[0], y0 + loc[1])
+
+        return best_val, best_loc
 
     def detect_resolution(self, screenshot: np.ndarray) -> Tuple[int, int]:
         """
@@ -138,15 +919,47 @@ class ImageProcessor:
             logger.info(f"Обнаружено разрешение {resolution}, " +
                         f"используется масштабный коэффициент {self.scale_factor}")
 
+            self._prepare_scaled_templates()
+
         return resolution
 
+    def _prepare_scaled_templates(self) -> None:
+        """
+        Подготовка масштабированных пирамид загруженных шаблонов для текущего
+        коэффициента и вариаций +/-10%, чтобы cv2.resize не выполнялся при поиске.
+        """
+        scales = (self.scale_factor, self.scale_factor * 0.9, self.scale_factor * 1.1)
+
+        with self._templates_lock:
+            names = list(self.templates)
+
+        for name in names:
+            preprocess_type = self._default_preprocess_types(name)[0]
+            for scale in scales:
+                self._scaled_template_levels(name, preprocess_type, scale)
+
+        logger.debug(f"Подготовлены масштабированные шаблоны для коэффициента {self.scale_factor}: {len(names)}")
+
+    def _clahe(self) -> Any:
+        """
+        Объект CLAHE для выравнивания контраста, создаваемый один раз на поток
+        (apply хранит промежуточные буферы в самом объекте).
+
+        Returns:
+            Экземпляр cv2.CLAHE
+        """
+        clahe = getattr(self._local, "clahe", None)
+        if clahe is None:
+            clahe = self._local.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        return clahe
+
     def preprocess_image(self, image: np.ndarray, preprocess_type: str = "default") -> np.ndarray:
         """
         Предобработка изображения для улучшения распознавания.
 
         Args:
             image: Исходное изображение
-            preprocess_type: Тип предобработки ("default", "enhance", "edges", "hsv")
+            preprocess_type: Тип предобработки ("default", "color", "enhance", "edges", "hsv")
 
         Returns:
             Обработанное изображение
@@ -154,17 +967,16 @@ class ImageProcessor:
         if image is None:
             return None
 
-        if preprocess_type == "default":
+        if preprocess_type in ("default", "color"):
             # Базовая обработка - просто возвращаем оригинал
+            # (для "default" поиск затем переводит кадр в оттенки серого, см. _screen_levels)
             return image
 
         elif preprocess_type == "enhance":
             # Улучшение контраста и яркости
             lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-            l = clahe.apply(l)
-            lab = cv2.merge((l, a, b))
+            # Канал яркости обновляется на месте, без split/merge всего изображения
+            lab[..., 0] = self._clahe().apply(np.ascontiguousarray(lab[..., 0]))
             return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
 
         elif preprocess_type == "edges":
@@ -225,6 +1037,18 @@ class ImageProcessor:
         # Иначе возвращаем порог по умолчанию
         return self.template_thresholds["default"]
 
+    def _default_preprocess_types(self, template_name: str) -> List[str]:
+        """
+        Методы предобработки, если вызывающий код их не указал.
+
+        Args:
+            template_name: Имя шаблона
+
+        Returns:
+            ["color"] для шаблонов из color_templates, иначе ["default"]
+        """
+        return ["color"] if template_name in self.color_templates else ["default"]
+
     def find_template(self,
                       screenshot: np.ndarray,
                       template_name: str,
@@ -256,58 +1080,98 @@ class ImageProcessor:
         if threshold is None:
             threshold = self.get_optimal_threshold(template_name)
 
-        # Если не указаны методы предобработки, используем только стандартный
+        # Если не указаны методы предобработки, используем стандартный для данного шаблона
         if preprocess_types is None:
-            preprocess_types = ["default"]
+            preprocess_types = self._default_preprocess_types(template_name)
+
+        # Получаем шаблон (загружаем, если он еще не в кэше)
+        if self._get_template(template_name) is None:
+            return None
+
+        return self._search_template(screenshot, template_name, threshold, preprocess_types, scale_variations)
+
+    def _search_template(self,
+                         screenshot: np.ndarray,
+                         template_name: str,
+                         threshold: float,
+                         preprocess_types: List[str],
+                         scale_variations: Optional[List[float]],
+                         frame_cache: Optional[Dict[str, List[np.ndarray]]] = None,
+                         last_hits: Optional[Dict[str, Tuple[int, int, int, int]]] = None
+                         ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Поиск уже загруженного шаблона на непустом скриншоте (параметры разрешены вызывающим кодом).
 
+        Args:
+            screenshot: Изображение-скриншот
+            template_name: Имя шаблона (должен быть в кэше)
+            threshold: Порог сходства
+            preprocess_types: Список методов предобработки
+            scale_variations: Список вариаций масштаба или None
+            frame_cache: Общие для нескольких шаблонов пирамиды этого скриншота по типу предобработки
+            last_hits: Прошлые позиции шаблонов вызывающего потока или None (позиции текущего потока)
+
+        Returns:
+            Координаты найденного шаблона (x, y, width, height) или None
+        """
         # Если не указаны вариации масштаба, используем текущий и +/-10%
         if scale_variations is None:
             scale_variations = [self.scale_factor, self.scale_factor * 0.9, self.scale_factor * 1.1]
 
-        # Получаем шаблон
-        if template_name not in self.templates:
-            # Попробуем загрузить шаблон, если он еще не в кэше
-            template_path = self.assets_path / f"{template_name}.png"
-            if template_path.exists():
-                self.templates[template_name] = cv2.imread(str(template_path))
-                logger.debug(f"Загружен шаблон по запросу: {template_name}")
-            else:
-                logger.error(f"Шаблон не найден: {template_name}")
-                return None
-
-        template = self.templates[template_name]
+        template = self._get_template(template_name)
+        if template is None:
+            return None
 
         # Проверяем размеры
         if template.shape[0] > screenshot.shape[0] or template.shape[1] > screenshot.shape[1]:
             logger.error(f"Шаблон {template_name} больше скриншота")
             return None
 
+        # Элементы интерфейса обычно остаются на месте: сначала проверяем прошлую позицию
+        if last_hits is None:
+            last_hits = self._last_hits()
+        hit = last_hits.get(template_name)
+        if "default" in preprocess_types and hit is not None:
+            screen_gray = self._screen_levels(screenshot, "default", frame_cache)[0]
+            template_match = self._check_last_hit(screen_gray, template_name, hit, threshold)
+            if template_match:
+                last_hits[template_name] = template_match
+                return template_match
+
         best_match = None
         best_val = -1
+        best_type = None
 
         # Перебираем все комбинации методов предобработки и масштабов
         for preprocess_type in preprocess_types:
-            processed_screenshot = self.preprocess_image(screenshot, preprocess_type)
+            # Стандартный поиск идет по одному каналу яркости - втрое меньше данных (см. _screen_levels)
+            screen_levels = self._screen_levels(screenshot, preprocess_type, frame_cache)
 
             for scale in scale_variations:
-                # Масштабируем шаблон под текущий масштаб
-                scaled_template = self.scale_image(template, scale)
+                # Масштабированный шаблон и его пирамида берутся из кэша
+                scaled_levels = self._scaled_template_levels(template_name, preprocess_type, scale)
+                if scaled_levels is None:
+                    return None
+                template_levels, template_dev = scaled_levels
+                scaled_template = template_levels[0]
 
                 # Проверяем, что масштабированный шаблон не больше скриншота
-                if (scaled_template.shape[0] > processed_screenshot.shape[0] or
-                        scaled_template.shape[1] > processed_screenshot.shape[1]):
+                if (scaled_template.shape[0] > screen_levels[0].shape[0] or
+                        scaled_template.shape[1] > screen_levels[0].shape[1]):
                     continue
 
-                # Поиск шаблона
+                # Поиск шаблона: грубый уровень пирамиды, затем уточнение
                 try:
-                    result = cv2.matchTemplate(processed_screenshot, scaled_template, cv2.TM_CCOEFF_NORMED)
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                    _extend_pyramid(screen_levels, len(template_levels) - 1)
+                    max_val, max_loc = self._match_pyramid(screen_levels, template_levels, threshold,
+                                                           template_dev)
 
                     if max_val > best_val:
                         best_val = max_val
                         x, y = max_loc
                         h, w = scaled_template.shape[:2]
                         best_match = (x, y, w, h)
+                        best_type = preprocess_type
 
                 except Exception as e:
                     logger.error(f"Ошибка при поиске шаблона {template_name}: {e}")
@@ -317,12 +1181,324 @@ class ImageProcessor:
         if best_val >= threshold:
             logger.debug(f"Найден шаблон {template_name} на координатах {best_match[:2]} "
                          f"со сходством {best_val:.2f} (порог: {threshold:.2f})")
+            if best_type == "default":
+                last_hits[template_name] = best_match
             return best_match
         else:
             logger.debug(f"Шаблон {template_name} не найден "
                          f"(лучшее сходство: {best_val:.2f}, порог: {threshold:.2f})")
             return None
 
+    def _check_last_hit(self,
+                        screen_gray: np.ndarray,
+                        template_name: str,
+                        hit: Tuple[int, int, int, int],
+                        threshold: float) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Поиск шаблона рядом с прошлой позицией. Сначала dHash области сравнивается
+        с хэшем шаблона и совпадение подтверждается одной корреляцией того же размера;
+        если шаблон сдвинулся, он ищется в окне с отступом max(w, h) вокруг прошлой позиции.
+
+        Args:
+            screen_gray: Полутоновый скриншот
+            template_name: Имя шаблона
+            hit: Прошлая позиция шаблона (x, y, width, height)
+            threshold: Порог сходства
+
+        Returns:
+            Координаты (x, y, width, height), если шаблон найден рядом с прошлой позицией, иначе None
+        """
+        x, y, w, h = hit
+        screen_h, screen_w = screen_gray.shape[:2]
+        if x + w > screen_w or y + h > screen_h:
+            return None
+
+        # Шаблон мог быть вытеснен другим потоком: берем его и хэш под блокировкой кэша
+        if self._get_template(template_name) is None:
+            return None
+        with self._templates_lock:
+            template = self.templates_gray.get(template_name)
+            info = self.template_info.get(template_name)
+        if template is None or info is None:
+            return None
+
+        if template.shape[:2] != (h, w):
+            template = cv2.resize(template, (w, h), interpolation=cv2.INTER_AREA)
+
+        # Шаблон на прежнем месте: хэш близок и корреляция в этой точке выше порога
+        roi = screen_gray[y:y + h, x:x + w]
+        distance = bin(_dhash(roi) ^ info["dhash"]).count("1")
+        if distance <= DHASH_MAX_DISTANCE:
+            score = _ncc_same_size(roi, template)
+            if score >= threshold:
+                logger.debug(f"Шаблон {template_name} на прежней позиции {(x, y)} со сходством {score:.2f}")
+                return x, y, w, h
+
+        # Шаблон мог немного сместиться: ищем в окне вокруг прошлой позиции
+        pad = max(w, h)
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(screen_w, x + w + pad), min(screen_h, y + h + pad)
+
+        result = self._match_template(screen_gray[y0:y1, x0:x1], template, reuse_buffer=True)
+        max_val, max_loc = _peak(result)
+        if max_val < threshold:
+            return None
+
+        template_match = (x0 + max_loc[0], y0 + max_loc[1], w, h)
+        logger.debug(f"Шаблон {template_name} найден рядом с прежней позицией: {template_match[:2]} "
+                     f"со сходством {max_val:.2f}")
+        return template_match
+
+    def _last_hits(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Прошлые позиции шаблонов текущего потока. Каждый эмулятор работает в своем
+        потоке, поэтому находки на одном экране не влияют на поиск на другом.
+
+        Returns:
+            Словарь {имя шаблона: (x, y, width, height)}
+        """
+        last_hits = getattr(self._local, "last_hits", None)
+        if last_hits is None:
+            last_hits = self._local.last_hits = {}
+        return last_hits
+
+    def _frame_cache(self, screenshot: np.ndarray) -> Dict[str, List[np.ndarray]]:
+        """
+        Кэш предобработки последнего скриншота текущего потока. Кадр сравнивается
+        по объекту: пока вызывающий код ищет шаблоны на том же массиве, серое
+        изображение, HSV, CLAHE и их пирамиды не пересчитываются. Скриншот при
+        этом считается неизменяемым.
+
+        Args:
+            screenshot: Изображение-скриншот
+
+        Returns:
+            Словарь {тип предобработки: уровни пирамиды} для этого кадра
+        """
+        # Ссылка на кадр держится в кэше, поэтому его id не может достаться новому массиву
+        if getattr(self._local, "frame", None) is not screenshot:
+            self._local.frame = screenshot
+            self._local.frame_cache = {}
+        return self._local.frame_cache
+
+    def _screen_levels(self,
+                       screenshot: np.ndarray,
+                       preprocess_type: str,
+                       frame_cache: Optional[Dict[str, List[np.ndarray]]] = None) -> List[np.ndarray]:
+        """
+        Пирамида предобработанного скриншота; она строится один раз на кадр
+        и используется всеми шаблонами, которые ищутся на этом кадре.
+
+        Args:
+            screenshot: Изображение-скриншот
+            preprocess_type: Тип предобработки ("default" - поиск в оттенках серого)
+            frame_cache: Кэш пирамид кадра или None (кэш последнего кадра потока)
+
+        Returns:
+            Список уровней пирамиды (достраивается по мере необходимости)
+        """
+        if frame_cache is None:
+            frame_cache = self._frame_cache(screenshot)
+
+        screen_levels = frame_cache.get(preprocess_type)
+        if screen_levels is not None:
+            return screen_levels
+
+        if preprocess_type == "default":
+            screen_levels = [_to_gray(screenshot)]
+        else:
+            screen_levels = [self.preprocess_image(screenshot, preprocess_type)]
+
+        frame_cache[preprocess_type] = screen_levels
+        return screen_levels
+
+    def find_any_template(self,
+                          screenshot: np.ndarray,
+                          template_names: List[str],
+                          threshold: float = None,
+                          preprocess_types: List[str] = None,
+                          scale_variations: List[float] = None) -> Optional[Tuple[str, Tuple[int, int, int, int]]]:
+        """
+        Поиск первого из нескольких шаблонов на одном скриншоте. Предобработка
+        и пирамида скриншота вычисляются один раз для всех шаблонов.
+
+        Args:
+            screenshot: Изображение-скриншот
+            template_names: Имена шаблонов в порядке приоритета
+            threshold: Порог сходства (если None, для каждого шаблона используется свой)
+            preprocess_types: Список методов предобработки для использования
+            scale_variations: Список вариаций масштаба для поиска
+
+        Returns:
+            Кортеж (имя шаблона, (x, y, width, height)) для первого найденного шаблона или None
+        """
+        if screenshot is None or screenshot.size == 0:
+            logger.error("Скриншот пустой или поврежден")
+            return None
+
+        self.detect_resolution(screenshot)
+
+        names = [name for name in template_names if self._get_template(name) is not None]
+        thresholds = {name: threshold if threshold is not None else self.get_optimal_threshold(name)
+                      for name in names}
+
+        types = {name: preprocess_types or self._default_preprocess_types(name) for name in names}
+
+        return self._search_any(screenshot, names, thresholds, types, scale_variations)
+
+    def _viable_templates(self, screenshot: np.ndarray, template_names: List[str]) -> List[str]:
+        """
+        Отбор шаблонов, которые помещаются на скриншоте.
+
+        Args:
+            screenshot: Изображение-скриншот
+            template_names: Имена шаблонов
+
+        Returns:
+            Имена шаблонов не крупнее скриншота (в исходном порядке)
+        """
+        # Шаблоны крупнее скриншота отсекаются одним сравнением массивов
+        name_index, widths, heights = self._template_table()
+        viable = (widths <= screenshot.shape[1]) & (heights <= screenshot.shape[0])
+        return [name for name in template_names
+                if name_index.get(name) is None or viable[name_index[name]]]
+
+    def _build_frame_levels(self,
+                            screenshot: np.ndarray,
+                            template_names: List[str],
+                            preprocess_types: Dict[str, List[str]],
+                            frame_cache: Dict[str, List[np.ndarray]]) -> None:
+        """
+        Построение полных пирамид кадра до передачи поиска в пул потоков,
+        чтобы потоки их только читали.
+
+        Args:
+            screenshot: Изображение-скриншот
+            template_names: Имена шаблонов, которые будут искаться
+            preprocess_types: Список методов предобработки для каждого шаблона
+            frame_cache: Кэш пирамид кадра
+        """
+        for preprocess_type in {t for name in template_names for t in preprocess_types[name]}:
+            _extend_pyramid(self._screen_levels(screenshot, preprocess_type, frame_cache), PYRAMID_MAX_LEVEL)
+
+    def _search_any(self,
+                    screenshot: np.ndarray,
+                    template_names: List[str],
+                    thresholds: Dict[str, float],
+                    preprocess_types: Dict[str, List[str]],
+                    scale_variations: Optional[List[float]]) -> Optional[Tuple[str, Tuple[int, int, int, int]]]:
+        """
+        Поиск загруженных шаблонов на одном кадре с общим кэшем пирамид; несколько
+        шаблонов сопоставляются параллельно в пуле потоков.
+
+        Args:
+            screenshot: Изображение-скриншот
+            template_names: Имена загруженных шаблонов в порядке приоритета
+            thresholds: Порог сходства для каждого шаблона
+            preprocess_types: Список методов предобработки для каждого шаблона
+            scale_variations: Список вариаций масштаба или None
+
+        Returns:
+            Кортеж (имя шаблона, (x, y, width, height)) или None
+        """
+        candidates = self._viable_templates(screenshot, template_names)
+
+        frame_cache = self._frame_cache(screenshot)
+        last_hits = self._last_hits()  # Пул потоков пишет в позиции вызывающего потока
+        if len(candidates) < 2:
+            for name in candidates:
+                template_match = self._search_template(
+                    screenshot, name, thresholds[name], preprocess_types[name], scale_variations, frame_cache, last_hits
+                )
+                if template_match:
+                    return name, template_match
+            return None
+
+        self._build_frame_levels(screenshot, candidates, preprocess_types, frame_cache)
+
+        stop = threading.Event()
+
+        def search(name: str) -> Optional[Tuple[int, int, int, int]]:
+            if stop.is_set():
+                return None
+            return self._search_template(
+                screenshot, name, thresholds[name], preprocess_types[name], scale_variations, frame_cache, last_hits
+            )
+
+        # OpenCV отпускает GIL, поэтому шаблоны сопоставляются параллельно
+        futures = [self._pool.submit(search, name) for name in candidates]
+
+        # Результат выбирается по приоритету имен; после находки менее приоритетные отменяются
+        found = None
+        for name, future in zip(candidates, futures):
+            if found is not None:
+                future.cancel()
+                continue
+            try:
+                template_match = future.result()
+            except Exception as e:
+                logger.error(f"Ошибка при поиске шаблона {name}: {e}")
+                continue
+            if template_match:
+                found = (name, template_match)
+                stop.set()
+
+        return found
+
+    def find_any_of(self,
+                    screenshot: np.ndarray,
+                    template_names: List[str],
+                    threshold: float = None,
+                    preprocess_types: List[str] = None,
+                    scale_variations: List[float] = None) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Поиск всех указанных шаблонов на одном скриншоте. В отличие от find_any_template
+        поиск не останавливается на первом найденном: шаблоны сопоставляются параллельно
+        в пуле потоков, а предобработка скриншота выполняется один раз.
+
+        Args:
+            screenshot: Изображение-скриншот
+            template_names: Имена шаблонов
+            threshold: Порог сходства (если None, для каждого шаблона используется свой)
+            preprocess_types: Список методов предобработки для использования
+            scale_variations: Список вариаций масштаба для поиска
+
+        Returns:
+            Словарь {имя шаблона: (x, y, width, height)} для найденных шаблонов
+        """
+        if screenshot is None or screenshot.size == 0:
+            logger.error("Скриншот пустой или поврежден")
+            return {}
+
+        self.detect_resolution(screenshot)
+
+        names = [name for name in template_names if self._get_template(name) is not None]
+        names = self._viable_templates(screenshot, names)
+        thresholds = {name: threshold if threshold is not None else self.get_optimal_threshold(name)
+                      for name in names}
+        types = {name: preprocess_types or self._default_preprocess_types(name) for name in names}
+
+        frame_cache = self._frame_cache(screenshot)
+        last_hits = self._last_hits()  # Пул потоков пишет в позиции вызывающего потока
+        self._build_frame_levels(screenshot, names, types, frame_cache)
+
+        def search(name: str) -> Optional[Tuple[int, int, int, int]]:
+            try:
+                return self._search_template(
+                    screenshot, name, thresholds[name], types[name], scale_variations, frame_cache, last_hits
+                )
+            except Exception as e:
+                logger.error(f"Ошибка при поиске шаблона {name}: {e}")
+                return None
+
+        # OpenCV отпускает GIL, поэтому шаблоны сопоставляются параллельно
+        found = {}
+        for name, template_match in zip(names, self._pool.map(search, names)):
+            if template_match:
+                found[name] = template_match
+
+        return found
+
     def find_all_templates(self,
                            screenshot: np.ndarray,
                            template_name: str,
@@ -355,39 +1531,38 @@ class ImageProcessor:
         if threshold is None:
             threshold = self.get_optimal_threshold(template_name)
 
-        # Если не указаны методы предобработки, используем только стандартный
+        # Если не указаны методы предобработки, используем стандартный для данного шаблона
         if preprocess_types is None:
-            preprocess_types = ["default"]
+            preprocess_types = self._default_preprocess_types(template_name)
 
         # Если не указаны вариации масштаба, используем текущий
         if scale_variations is None:
             scale_variations = [self.scale_factor]
 
-        # Получаем шаблон
-        if template_name not in self.templates:
-            template_path = self.assets_path / f"{template_name}.png"
-            if template_path.exists():
-                self.templates[template_name] = cv2.imread(str(template_path))
-            else:
-                logger.error(f"Шаблон не найден: {template_name}")
-                return []
-
-        template = self.templates[template_name]
+        # Получаем шаблон (загружаем, если он еще не в кэше)
+        template = self._get_template(template_name)
+        if template is None:
+            return []
 
         # Проверяем размеры
         if template.shape[0] > screenshot.shape[0] or template.shape[1] > screenshot.shape[1]:
             logger.error(f"Шаблон {template_name} больше скриншота")
             return []
 
-        best_matches = []
+        # Кандидаты накапливаются массивами: по одному блоку на каждую комбинацию
+        candidates = []
 
         # Перебираем все комбинации методов предобработки и масштабов
         for preprocess_type in preprocess_types:
-            processed_screenshot = self.preprocess_image(screenshot, preprocess_type)
+            # Стандартный поиск идет по одному каналу яркости - втрое меньше данных
+            processed_screenshot = self._screen_levels(screenshot, preprocess_type)[0]
 
             for scale in scale_variations:
-                # Масштабируем шаблон под текущий масштаб
-                scaled_template = self.scale_image(template, scale)
+                # Масштабированный шаблон берется из кэша
+                scaled_levels = self._scaled_template_levels(template_name, preprocess_type, scale)
+                if scaled_levels is None:
+                    return []
+                scaled_template = scaled_levels[0][0]
 
                 # Проверяем, что масштабированный шаблон не больше скриншота
                 if (scaled_template.shape[0] > processed_screenshot.shape[0] or
@@ -396,43 +1571,28 @@ class ImageProcessor:
 
                 # Поиск шаблона
                 try:
-                    result = cv2.matchTemplate(processed_screenshot, scaled_template, cv2.TM_CCOEFF_NORMED)
+                    result = self._match_template(processed_screenshot, scaled_template, reuse_buffer=True)
                     h, w = scaled_template.shape[:2]
 
-                    # Находим все локации выше порога
-                    locations = np.where(result >= threshold)
-
-                    # Преобразуем в список координат
-                    for pt in zip(*locations[::-1]):  # Разворачиваем, чтобы получить (x, y)
-                        best_matches.append((pt[0], pt[1], w, h, result[pt[1], pt[0]]))
+                    # Находим все локации выше порога (значения копируются до следующего поиска в буфер)
+                    mask = cv2.compare(result, float(threshold), cv2.CMP_GE)
+                    points = cv2.findNonZero(mask)
+                    if points is not None:
+                        points = points.reshape(-1, 2)
+                        xs, ys = points[:, 0], points[:, 1]
+                        candidates.append((xs, ys, np.full(xs.size, w), np.full(xs.size, h), result[ys, xs]))
 
                 except Exception as e:
                     logger.error(f"Ошибка при поиске шаблона {template_name}: {e}")
                     continue
 
-        # Сортируем по значению совпадения
-        best_matches.sort(key=lambda x: x[4], reverse=True)
-
-        # Убираем дубликаты (близкие координаты)
         filtered_matches = []
-        for match in best_matches:
-            x1, y1 = match[0], match[1]
-            w, h = match[2], match[3]
-            is_duplicate = False
-
-            for filtered in filtered_matches:
-                x2, y2 = filtered[0], filtered[1]
-                # Если точки близки друг к другу, считаем их дубликатами
-                if abs(x1 - x2) < w // 2 and abs(y1 - y2) < h // 2:
-                    is_duplicate = True
-                    break
+        if candidates:
+            xs, ys, ws, hs, scores = (np.concatenate(column) for column in zip(*candidates))
 
-            if not is_duplicate:
-                filtered_matches.append(match[:4])  # Отбрасываем значение совпадения
-
-                # Ограничиваем количество результатов
-                if len(filtered_matches) >= max_results:
-                    break
+            # Убираем дубликаты (близкие координаты)
+            for i in _suppress_duplicates(xs, ys, ws, hs, scores, max_results):
+                filtered_matches.append((int(xs[i]), int(ys[i]), int(ws[i]), int(hs[i])))
 
         logger.debug(f"Найдено {len(filtered_matches)} вхождений шаблона {template_name}")
         return filtered_matches
@@ -452,115 +1612,249 @@ class ImageProcessor:
 
     def wait_for_template(self,
                           adb_controller,
-                          template_name: str,
+                          template_name: Union[str, List[str]],
                           timeout: float = 10.0,
                           interval: float = 0.5,
                           threshold: float = None,
                           preprocess_types: List[str] = None,
                           scale_variations: List[float] = None,
-                          max_attempts: int = 20) -> Optional[Tuple[int, int]]:
+                          max_attempts: int = 20) -> Optional[Union[Tuple[int, int], Tuple[str, Tuple[int, int]]]]:
         """
-        Ожидание появления шаблона на экране.
+        Ожидание появления шаблона (или одного из нескольких шаблонов) на экране.
 
         Args:
             adb_controller: Контроллер ADB для получения скриншотов
-            template_name: Имя шаблона для поиска
+            template_name: Имя шаблона или список имен в порядке приоритета
             timeout: Максимальное время ожидания в секундах
-            interval: Интервал между проверками в секундах
+            interval: Максимальный интервал между проверками в секундах
+                (паузы начинаются с WAIT_INITIAL_DELAY и удваиваются до него)
             threshold: Порог сходства
             preprocess_types: Список методов предобработки для использования
             scale_variations: Список вариаций масштаба для поиска
-            max_attempts: Максимальное количество попыток
+            max_attempts: Максимальное количество попыток с полным интервалом
 
         Returns:
-            Координаты центра найденного шаблона или None, если шаблон не найден за отведенное время
+            Координаты центра найденного шаблона, для списка шаблонов - кортеж
+            (имя шаблона, координаты центра); None, если ничего не найдено за отведенное время
         """
-        import time
+        single = isinstance(template_name, str)
+        names = [template_name] if single else list(template_name)
+        label = ", ".join(names)
 
-        logger.info(f"Ожидание появления шаблона {template_name} (таймаут: {timeout}с)")
+        logger.info(f"Ожидание появления шаблона {label} (таймаут: {timeout}с)")
         start_time = time.time()
         attempts = 0
 
+        # Шаблоны и параметры поиска разрешаются один раз, а не на каждой итерации
+        names = [name for name in names if self._get_template(name) is not None]
+        if not names:
+            return None
+        thresholds = {name: threshold if threshold is not None else self.get_optimal_threshold(name)
+                      for name in names}
+        types = {name: preprocess_types or self._default_preprocess_types(name) for name in names}
+
+        previous_digest = None
+        delay = min(WAIT_INITIAL_DELAY, interval)
+        polls = 0
+
         while time.time() - start_time < timeout and attempts < max_attempts:
             try:
                 screenshot = adb_controller.get_screenshot()
-                template_match = self.find_template(
-                    screenshot, template_name, threshold, preprocess_types, scale_variations
-                )
-
-                if template_match:
+                found = None
+
+                if screenshot is None or screenshot.size == 0:
+                    logger.error("Скриншот пустой или поврежден")
+                else:
+                    # На неизменившемся кадре результат поиска тот же - пропускаем его
+                    digest = _frame_digest(screenshot)
+                    if digest != previous_digest:
+                        previous_digest = digest
+                        self.detect_resolution(screenshot)
+                        found = self._search_any(screenshot, names, thresholds, types, scale_variations)
+
+                if found:
+                    name, template_match = found
                     center = self.center_of_template(template_match)
-                    logger.info(f"Шаблон {template_name} найден на координатах {center} "
-                                f"(попытка {attempts + 1}, прошло {time.time() - start_time:.1f}с)")
-                    return center
+                    logger.info(f"Шаблон {name} найден на координатах {center} "
+                                f"(попытка {polls + 1}, прошло {time.time() - start_time:.1f}с)")
+                    return center if single else (name, center)
             except Exception as e:
-                logger.error(f"Ошибка при поиске шаблона {template_name}: {e}")
+                logger.error(f"Ошибка при поиске шаблона {label}: {e}")
 
-            attempts += 1
-            time.sleep(interval)
+            # Короткие паузы разгона не расходуют max_attempts, чтобы общее время ожидания не сокращалось
+            polls += 1
+            if delay >= interval:
+                attempts += 1
+            time.sleep(delay)
+            delay = min(delay * 2, interval)
 
-        logger.warning(f"Шаблон {template_name} не найден после {attempts} попыток за {time.time() - start_time:.1f}с")
+        logger.warning(f"Шаблон {label} не найден после {polls} попыток за {time.time() - start_time:.1f}с")
         return None
 
     def extract_text_from_region(self,
                                  screenshot: np.ndarray,
                                  region: Tuple[int, int, int, int],
                                  preprocess: bool = True,
-                                 lang: str = 'rus+eng') -> str:
+                                 lang: str = 'rus+eng',
+                                 psm: int = 7) -> str:
         """
         Извлечение текста из указанной области скриншота (для парсинга сезонов и серверов).
-        Для полноценной работы требуется установка pytesseract.
+        Для полноценной работы требуется установка tesserocr или pytesseract.
 
         Args:
             screenshot: Изображение-скриншот
             region: Область для извлечения текста (x, y, width, height)
             preprocess: Использовать предобработку для улучшения распознавания
             lang: Язык текста для распознавания
+            psm: Режим сегментации Tesseract (7 - одна строка текста, 6 - блок текста)
 
         Returns:
             Извлеченный текст
         """
-        try:
-            import pytesseract
+        if tesserocr is None and pytesseract is None:
+            logger.error("tesserocr и pytesseract не установлены. Установите один из них для распознавания текста")
+            return ""
 
+        try:
             x, y, w, h = region
             roi = screenshot[y:y + h, x:x + w]
 
-            if preprocess:
-                # Предобработка для улучшения распознавания
-                gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            # Распознавание текста с предобработанного изображения или без предобработки
+            image = self._prepare_ocr_image(roi) if preprocess else roi
 
-                # Применяем гауссовское размытие для уменьшения шума
-                blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-                # Адаптивная бинаризация для лучшего распознавания текста разного размера и цвета
-                thresh = cv2.adaptiveThreshold(
-                    blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2
-                )
-
-                # Морфологические операции для удаления шума и улучшения текста
-                kernel = np.ones((1, 1), np.uint8)
-                opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
-                closing = cv2.morphologyEx(opening, cv2.MORPH_CLOSE, kernel)
-
-                # Распознавание текста с предобработанного изображения
-                text = pytesseract.image_to_string(closing, lang=lang, config='--psm 6')
+            if tesserocr is not None:
+                text = self._tesserocr_text(image, lang, psm)
             else:
-                # Распознавание текста без предобработки
-                text = pytesseract.image_to_string(roi, lang=lang)
+                text = pytesseract.image_to_string(image, lang=lang, config=f'--oem 1 --psm {psm}')
 
             # Удаляем лишние пробелы и переносы строк
             text = " ".join(text.strip().split())
             logger.debug(f"Извлечен текст из региона {region}: {text}")
             return text
 
-        except ImportError:
-            logger.error("pytesseract не установлен. Установите его для распознавания текста")
-            return ""
         except Exception as e:
             logger.error(f"Ошибка при извлечении текста: {e}")
             return ""
 
+    def _tesserocr_text(self, image: np.ndarray, lang: str, psm: int) -> str:
+        """
+        Распознавание через tesserocr. Экземпляр Tesseract с загруженными языковыми
+        данными создается один раз на поток и язык (API не потокобезопасен).
+
+        Args:
+            image: Полутоновое или BGR-изображение
+            lang: Язык текста для распознавания
+            psm: Режим сегментации Tesseract
+
+        Returns:
+            Распознанный текст
+        """
+        apis = getattr(self._local, "tesseract_apis", None)
+        if apis is None:
+            apis = self._local.tesseract_apis = {}
+
+        api = apis.get(lang)
+        if api is None:
+            api = apis[lang] = tesserocr.PyTessBaseAPI(lang=lang, oem=tesserocr.OEM.LSTM_ONLY)
+
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+
+        api.SetPageSegMode(psm)
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        return api.GetUTF8Text()
+
+    @staticmethod
+    def _prepare_ocr_image(roi: np.ndarray) -> np.ndarray:
+        """
+        Предобработка области для улучшения распознавания текста.
+
+        Args:
+            roi: Область скриншота
+
+        Returns:
+            Бинаризованное полутоновое изображение
+        """
+        gray = _to_gray(roi)
+
+        # Применяем гауссовское размытие для уменьшения шума
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+
+        # Бинаризация Оцу сама подбирает порог под яркость текста и фона
+        _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        return thresh
+
+    def extract_text_from_regions(self,
+                                  screenshot: np.ndarray,
+                                  regions: List[Tuple[int, int, int, int]],
+                                  preprocess: bool = True,
+                                  lang: str = 'rus+eng') -> List[str]:
+        """
+        Извлечение текста из нескольких областей скриншота за один запуск Tesseract.
+        Области складываются друг под другом через полосы фона, а слова из
+        image_to_data распределяются по областям по вертикальной координате.
+        С tesserocr процесс не запускается, и области распознаются по отдельности.
+
+        Args:
+            screenshot: Изображение-скриншот
+            regions: Области для извлечения текста [(x, y, width, height), ...]
+            preprocess: Использовать предобработку для улучшения распознавания
+            lang: Язык текста для распознавания
+
+        Returns:
+            Извлеченный текст для каждой области (в том же порядке)
+        """
+        if tesserocr is None and pytesseract is None:
+            logger.error("tesserocr и pytesseract не установлены. Установите один из них для распознавания текста")
+            return [""] * len(regions)
+
+        if tesserocr is not None or len(regions) < 2:
+            return [self.extract_text_from_region(screenshot, region, preprocess, lang) for region in regions]
+
+        try:
+            images = []
+            for x, y, w, h in regions:
+                roi = screenshot[y:y + h, x:x + w]
+                images.append(self._prepare_ocr_image(roi) if preprocess else roi)
+
+            width = max(image.shape[1] for image in images)
+            bands = []
+            offsets = []
+            top = 0
+
+            for image in images:
+                # Фон оценивается по краям области, чтобы разделитель не превращался в текст
+                edge = np.concatenate((image[0], image[-1], image[:, 0], image[:, -1]))
+                background = np.median(edge, axis=0).tolist()
+                band = cv2.copyMakeBorder(image, 0, OCR_REGION_GAP, 0, width - image.shape[1],
+                                          cv2.BORDER_CONSTANT, value=background)
+                offsets.append(top)
+                top += band.shape[0]
+                bands.append(band)
+
+            # psm 6 - блок из нескольких строк: каждая область дает свою строку
+            data = pytesseract.image_to_data(np.vstack(bands), lang=lang, config='--oem 1 --psm 6',
+                                             output_type=pytesseract.Output.DICT)
+
+            words = [[] for _ in regions]
+            starts = np.array(offsets[1:])
+            for word, word_top, word_height in zip(data["text"], data["top"], data["height"]):
+                word = word.strip()
+                if word:
+                    index = int(np.searchsorted(starts, word_top + word_height // 2, side="right"))
+                    words[index].append(word)
+
+            texts = [" ".join(region_words) for region_words in words]
+            logger.debug(f"Извлечен текст из регионов {regions}: {texts}")
+            return texts
+
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном извлечении текста, распознаем области по отдельности: {e}")
+            return [self.extract_text_from_region(screenshot, region, preprocess, lang) for region in regions]
+
     def detect_season_text(self, screenshot: np.ndarray, season_regions: List[Tuple[int, int, int, int]]) -> Dict[
         str, Tuple[int, int]]:
         """
@@ -574,10 +1868,10 @@ class ImageProcessor:
             Словарь {название_сезона: координаты_центра}
         """
         seasons = {}
+        texts = self.extract_text_from_regions(screenshot, season_regions)
 
-        for region in season_regions:
+        for region, text in zip(season_regions, texts):
             x, y, w, h = region
-            text = self.extract_text_from_region(screenshot, region)
 
             # Нормализуем текст для поиска сезона
             text = text.lower().replace(" ", "")
@@ -607,10 +1901,10 @@ class ImageProcessor:
             Словарь {номер_сервера: координаты_центра}
         """
         servers = {}
+        texts = self.extract_text_from_regions(screenshot, server_regions)
 
-        for region in server_regions:
+        for region, text in zip(server_regions, texts):
             x, y, w, h = region
-            text = self.extract_text_from_region(screenshot, region)
 
             # Ищем цифры в тексте
             import re
@@ -251,7 +251,7 @@ class TutorialEngine:
         if wait_time > 0:
             time.sleep(wait_time)
 
-        self.adb.tap(x, y)
+        self.adb.tap(x, y, post_delay=0.3)
         return True
 
     def perform_swipe(self, start_x: int, start_y: int, end_x: int, end_y: int, duration_ms: int = 300) -> bool:
@@ -400,7 +400,7 @@ class TutorialEngine:
 
         if season in season_coords:
             x, y = season_coords[season]
-            self.adb.tap(x, y)
+            self.adb.tap(x, y, post_delay=0.3)
             logger.info(f"Клик по сезону {season} на координатах ({x}, {y})")
             return True
         else:
@@ -450,7 +450,7 @@ class TutorialEngine:
             if target_server in servers:
                 # Если нашли нужный сервер, кликаем по его координатам
                 x, y = servers[target_server]
-                self.adb.tap(x, y)
+                self.adb.tap(x, y, post_delay=0.3)
                 logger.info(f"Клик по серверу {target_server} на координатах ({x}, {y})")
                 return True
 
@@ -958,7 +958,7 @@ def _find_and_click_skip_or_shoot(engine: TutorialEngine) -> bool:
         if shoot_match:
             # Если нашли кнопку выстрела, кликаем по ней
             x, y = engine.image_processor.center_of_template(shoot_match)
-            engine.adb.tap(x, y)
+            engine.adb.tap(x, y, post_delay=0.3)
             logger.info("Найдена и нажата кнопка выстрела")
             return True
 
@@ -1048,7 +1048,7 @@ def _click_until_image_found(engine: TutorialEngine, x: int, y: int, image_name:
         if template_match:
             # Если нашли, кликаем по нему
             x_img, y_img = engine.image_processor.center_of_template(template_match)
-            engine.adb.tap(x_img, y_img)
+            engine.adb.tap(x_img, y_img, post_delay=0.3)
             logger.info(f"Найдено изображение {image_name}, клик по координатам ({x_img}, {y_img})")
             return True
 
@@ -1081,5 +1081,5 @@ def _wait_and_click(engine: TutorialEngine, x: int, y: int, wait_time: float) ->
         True всегда
     """
     time.sleep(wait_time)
-    engine.adb.tap(x, y)
+    engine.adb.tap(x, y, post_delay=0.3)
     return True
\ No newline at end of file
@@ -947,15 +947,17 @@ class MainWindow(QMainWindow):
         # Получаем список всех эмуляторов
         emulators = self.emulator_manager.list_emulators()
 
+        # Проверяем все запущенные эмуляторы параллельно
+        running = [int(emu["index"]) for emu in emulators if emu["status"] == "running"]
+        responsive = self.emulator_manager.check_many_responsive(running)
+
         restarted = 0
-        for emu in emulators:
-            if emu["status"] == "running":
-                # Проверяем, отвечает ли эмулятор
-                if not self.emulator_manager.is_emulator_responsive(int(emu["index"])):
-                    # Перезапускаем эмулятор
-                    success = self.emulator_manager.restart_if_unresponsive(int(emu["index"]))
-                    if success:
-                        restarted += 1
+        for index in running:
+            if not responsive[index]:
+                # Перезапускаем эмулятор
+                success = self.emulator_manager.restart_if_unresponsive(index)
+                if success:
+                    restarted += 1
 
         # Сообщаем о результате
         if restarted > 0:
@@ -1610,6 +1612,10 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'parallel_executor'):
             self.parallel_executor.stop()
 
+        # Завершаем пулы потоков менеджера эмуляторов
+        if hasattr(self, 'emulator_manager'):
+            self.emulator_manager.shutdown(wait=False)
+
         # Удаляем обработчик логов
         if hasattr(self, 'ui_logger_handler') and self.ui_logger_handler:
             remove_ui_logger(self.ui_logger_handler)
@@ -158,7 +158,7 @@ class GameTester:
             description: Описание действия
         """
         # Выполняем клик
-        self.adb.tap(x, y)
+        self.adb.tap(x, y, post_delay=0.3)
 
         # Если идет запись, сохраняем действие
         if self.recording:
@@ -344,7 +344,7 @@ class GameTester:
                 x, y = self.image_processor.center_of_template(template_match)
 
                 # Выполняем клик
-                self.adb.tap(x, y)
+                self.adb.tap(x, y, post_delay=0.3)
 
                 # Если идет запись, сохраняем действие
                 if self.recording: